@@ -0,0 +1,165 @@
+"""A local fake of the discovery service and of the measurement services it advertises."""
+
+from __future__ import annotations
+
+import types
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Type
+from unittest import mock
+
+import grpc
+from ni_measurement_plugin_sdk_service._internal.stubs.ni.measurementlink.discovery.v1 import (
+    discovery_service_pb2,
+    discovery_service_pb2_grpc,
+)
+from ni_measurement_plugin_sdk_service._internal.stubs.ni.measurementlink.measurement.v2 import (
+    measurement_service_pb2 as v2_measurement_service_pb2,
+    measurement_service_pb2_grpc as v2_measurement_service_pb2_grpc,
+)
+
+from ni_measurement_plugin_sequencer._snapshot import ServiceSnapshot
+
+_V2_MEASUREMENT_SERVICE_INTERFACE = "ni.measurementlink.measurement.v2.MeasurementService"
+_DISCOVERY_SERVICE_ADDRESS_FUNCTION = (
+    "ni_measurement_plugin_sdk_service.discovery._client._get_discovery_service_address"
+)
+
+
+class _FakeMeasurementService(v2_measurement_service_pb2_grpc.MeasurementServiceServicer):
+    def __init__(self, metadata: v2_measurement_service_pb2.GetMetadataResponse) -> None:
+        self._metadata = metadata
+
+    def GetMetadata(  # noqa: N802 - gRPC method name
+        self, request: v2_measurement_service_pb2.GetMetadataRequest, context: Any
+    ) -> v2_measurement_service_pb2.GetMetadataResponse:
+        return self._metadata
+
+    def Measure(  # noqa: N802 - gRPC method name
+        self, request: v2_measurement_service_pb2.MeasureRequest, context: Any
+    ) -> Iterator[v2_measurement_service_pb2.MeasureResponse]:
+        context.abort(grpc.StatusCode.UNIMPLEMENTED, "The fake service does not measure.")
+        yield from ()
+
+
+class _FakeDiscoveryService(discovery_service_pb2_grpc.DiscoveryServiceServicer):
+    def __init__(self) -> None:
+        self.descriptors: Dict[str, discovery_service_pb2.ServiceDescriptor] = {}
+        self.locations: Dict[str, discovery_service_pb2.ServiceLocation] = {}
+
+    def EnumerateServices(  # noqa: N802 - gRPC method name
+        self, request: discovery_service_pb2.EnumerateServicesRequest, context: Any
+    ) -> discovery_service_pb2.EnumerateServicesResponse:
+        return discovery_service_pb2.EnumerateServicesResponse(
+            available_services=[
+                descriptor
+                for descriptor in self.descriptors.values()
+                if request.provided_interface in descriptor.provided_interfaces
+            ]
+        )
+
+    def ResolveService(  # noqa: N802 - gRPC method name
+        self, request: discovery_service_pb2.ResolveServiceRequest, context: Any
+    ) -> discovery_service_pb2.ServiceLocation:
+        if request.service_class not in self.locations:
+            context.abort(grpc.StatusCode.NOT_FOUND, f"'{request.service_class}' not found.")
+        return self.locations[request.service_class]
+
+    def ResolveServiceWithInformation(  # noqa: N802 - gRPC method name
+        self, request: discovery_service_pb2.ResolveServiceWithInformationRequest, context: Any
+    ) -> discovery_service_pb2.ResolveServiceWithInformationResponse:
+        if request.service_class not in self.locations:
+            context.abort(grpc.StatusCode.NOT_FOUND, f"'{request.service_class}' not found.")
+        return discovery_service_pb2.ResolveServiceWithInformationResponse(
+            service_location=self.locations[request.service_class],
+            service_descriptor=self.descriptors[request.service_class],
+        )
+
+    def RegisterService(  # noqa: N802 - gRPC method name
+        self, request: discovery_service_pb2.RegisterServiceRequest, context: Any
+    ) -> discovery_service_pb2.RegisterServiceResponse:
+        context.abort(grpc.StatusCode.UNIMPLEMENTED, "The fake service is read-only.")
+        return discovery_service_pb2.RegisterServiceResponse()
+
+    def UnregisterService(  # noqa: N802 - gRPC method name
+        self, request: discovery_service_pb2.UnregisterServiceRequest, context: Any
+    ) -> discovery_service_pb2.UnregisterServiceResponse:
+        context.abort(grpc.StatusCode.UNIMPLEMENTED, "The fake service is read-only.")
+        return discovery_service_pb2.UnregisterServiceResponse()
+
+    def EnumerateComputeNodes(  # noqa: N802 - gRPC method name
+        self, request: discovery_service_pb2.EnumerateComputeNodesRequest, context: Any
+    ) -> discovery_service_pb2.EnumerateComputeNodesResponse:
+        return discovery_service_pb2.EnumerateComputeNodesResponse()
+
+
+class FakeMeasurementServices:
+    """Serves a fake discovery service and one fake measurement service per snapshot.
+
+    Each measurement service listens on its own local port and only implements
+    GetMetadata. While this is entered, the discovery clients created in this process
+    connect to the fake discovery service instead of the NI Discovery Service.
+    """
+
+    def __init__(self, services: List[ServiceSnapshot], max_workers: int = 8) -> None:
+        """Initialize the fake services.
+
+        Args:
+            services: The measurement services to advertise, in enumeration order.
+
+            max_workers: The number of threads that handle the requests of all services.
+        """
+        self._services = services
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._servers: List[grpc.Server] = []
+        self._patcher: Optional[Any] = None
+
+    def __enter__(self) -> FakeMeasurementServices:
+        """Start the fake services."""
+        discovery_service = _FakeDiscoveryService()
+        for service in self._services:
+            server = grpc.server(self._executor)
+            v2_measurement_service_pb2_grpc.add_MeasurementServiceServicer_to_server(
+                _FakeMeasurementService(service.metadata), server
+            )
+            port = server.add_insecure_port("localhost:0")
+            server.start()
+            self._servers.append(server)
+
+            discovery_service.descriptors[service.service_class] = (
+                discovery_service_pb2.ServiceDescriptor(
+                    display_name=service.display_name,
+                    provided_interfaces=[_V2_MEASUREMENT_SERVICE_INTERFACE],
+                    service_class=service.service_class,
+                    versions=[service.version],
+                )
+            )
+            discovery_service.locations[service.service_class] = (
+                discovery_service_pb2.ServiceLocation(location="localhost", insecure_port=str(port))
+            )
+
+        server = grpc.server(self._executor)
+        discovery_service_pb2_grpc.add_DiscoveryServiceServicer_to_server(discovery_service, server)
+        port = server.add_insecure_port("localhost:0")
+        server.start()
+        self._servers.append(server)
+
+        self._patcher = mock.patch(
+            _DISCOVERY_SERVICE_ADDRESS_FUNCTION, return_value=f"localhost:{port}"
+        )
+        self._patcher.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        traceback: Optional[types.TracebackType],
+    ) -> None:
+        """Stop the fake services."""
+        if self._patcher is not None:
+            self._patcher.stop()
+            self._patcher = None
+        for server in self._servers:
+            server.stop(grace=None)
+        self._servers.clear()
+        self._executor.shutdown()
@@ -0,0 +1,154 @@
+"""Synthetic measurement plug-in metadata for the sequencer benchmarks."""
+
+import json
+from enum import Enum
+from typing import Any, cast, Dict, List, Optional, Tuple, Type
+
+from google.protobuf import any_pb2, descriptor_pool
+from google.protobuf.type_pb2 import Field
+from ni_measurement_plugin_sdk_service._internal.stubs.ni.measurementlink.measurement.v2 import (
+    measurement_service_pb2 as v2_measurement_service_pb2,
+)
+from ni_measurement_plugin_sdk_service.measurement.client_support import (
+    create_file_descriptor,
+    ParameterMetadata,
+    serialize_parameters,
+)
+
+from ni_measurement_plugin_sequencer._snapshot import ServiceSnapshot
+
+_PIN_ANNOTATIONS = {
+    "ni/ioresource.instrument_type": "niDCPower",
+    "ni/type_specialization": "ioresource",
+}
+_FUNCTION_VALUES = {"DC_VOLTS": 1, "AC_VOLTS": 2, "DC_CURRENT": 3, "AC_CURRENT": 4, "RESISTANCE": 5}
+_FUNCTION_ANNOTATIONS = {
+    "ni/type_specialization": "enum",
+    "ni/enum.values": json.dumps(_FUNCTION_VALUES),
+}
+
+# (name, type, repeated, default value, annotations) for the configurations of a source
+# measurement, modeled after the NI-DCPower Source DC Voltage example.
+_SOURCE_CONFIGURATIONS: List[Tuple[str, Field.Kind.ValueType, bool, Any, Dict[str, str]]] = [
+    ("pin_names", Field.TYPE_STRING, True, ["Pin1"], _PIN_ANNOTATIONS),
+    ("voltage_level", Field.TYPE_DOUBLE, False, 6.0, {}),
+    ("voltage_level_range", Field.TYPE_DOUBLE, False, 6.0, {}),
+    ("current_limit", Field.TYPE_DOUBLE, False, 0.01, {}),
+    ("current_limit_range", Field.TYPE_DOUBLE, False, 0.01, {}),
+    ("source_delay", Field.TYPE_DOUBLE, False, 0.0, {}),
+]
+_SOURCE_OUTPUTS: List[Tuple[str, Field.Kind.ValueType, bool, Dict[str, str]]] = [
+    ("measurement_sites", Field.TYPE_INT32, True, {}),
+    ("measurement_pin_names", Field.TYPE_STRING, True, {}),
+    ("voltage_measurements", Field.TYPE_DOUBLE, True, {}),
+    ("current_measurements", Field.TYPE_DOUBLE, True, {}),
+    ("in_compliance", Field.TYPE_BOOL, True, {}),
+]
+
+# The configurations and outputs of a measure measurement, modeled after the NI-DMM example.
+_MEASURE_CONFIGURATIONS: List[Tuple[str, Field.Kind.ValueType, bool, Any, Dict[str, str]]] = [
+    ("pin_name", Field.TYPE_STRING, False, "Pin1", _PIN_ANNOTATIONS),
+    ("measurement_type", Field.TYPE_ENUM, False, 1, _FUNCTION_ANNOTATIONS),
+    ("range", Field.TYPE_DOUBLE, False, 10.0, {}),
+    ("resolution_digits", Field.TYPE_DOUBLE, False, 5.5, {}),
+    ("use_auto_range", Field.TYPE_BOOL, False, False, {}),
+    ("sample_count", Field.TYPE_INT32, False, 1, {}),
+]
+_MEASURE_OUTPUTS: List[Tuple[str, Field.Kind.ValueType, bool, Dict[str, str]]] = [
+    ("measured_value", Field.TYPE_DOUBLE, False, {}),
+    ("signal_out_of_range", Field.TYPE_BOOL, False, {}),
+    ("absolute_resolution", Field.TYPE_DOUBLE, False, {}),
+]
+
+
+def create_service_snapshots(count: int) -> List[ServiceSnapshot]:
+    """Create snapshots of the given number of synthetic measurement plug-ins.
+
+    The plug-ins alternate between a source measurement and a measure measurement, so the
+    generated clients cover repeated, enum and pin parameters.
+    """
+    return [_create_service_snapshot(index) for index in range(count)]
+
+
+def _create_service_snapshot(index: int) -> ServiceSnapshot:
+    if index % 2 == 0:
+        kind, configurations, outputs = "Source", _SOURCE_CONFIGURATIONS, _SOURCE_OUTPUTS
+    else:
+        kind, configurations, outputs = "Measure", _MEASURE_CONFIGURATIONS, _MEASURE_OUTPUTS
+    service_class = f"ni.benchmarks.Synthetic{kind}{index}_Python"
+    display_name = f"Synthetic {kind} {index} (Py)"
+
+    metadata = v2_measurement_service_pb2.GetMetadataResponse()
+    metadata.measurement_details.display_name = display_name
+    metadata.measurement_details.version = "1.0.0"
+    signature = metadata.measurement_signature
+    signature.configuration_parameters_message_type = f"{service_class}.Configurations"
+    signature.outputs_message_type = f"{service_class}.Outputs"
+
+    configuration_metadata: List[ParameterMetadata] = []
+    for name, type, repeated, default_value, annotations in configurations:
+        parameter = signature.configuration_parameters.add(name=name, type=type, repeated=repeated)
+        parameter.annotations.update(annotations)
+        configuration_metadata.append(
+            ParameterMetadata.initialize(
+                display_name=name,
+                type=type,
+                repeated=repeated,
+                default_value=default_value,
+                annotations=annotations,
+                message_type="",
+                enum_type=_get_enum_type(annotations),
+            )
+        )
+
+    output_metadata: List[ParameterMetadata] = []
+    for name, type, repeated, annotations in outputs:
+        output = signature.outputs.add(name=name, type=type, repeated=repeated)
+        output.annotations.update(annotations)
+        output_metadata.append(
+            ParameterMetadata.initialize(
+                display_name=name,
+                type=type,
+                repeated=repeated,
+                default_value=None,
+                annotations=annotations,
+                message_type="",
+                enum_type=_get_enum_type(annotations),
+            )
+        )
+
+    create_file_descriptor(
+        input_metadata=configuration_metadata,
+        output_metadata=output_metadata,
+        service_name=service_class,
+        pool=descriptor_pool.Default(),
+    )
+    signature.configuration_defaults.CopyFrom(
+        any_pb2.Any(
+            type_url=f"type.googleapis.com/{service_class}.Configurations",
+            value=serialize_parameters(
+                dict(enumerate(configuration_metadata, start=1)),
+                [_get_default_value(parameter) for parameter in configuration_metadata],
+                f"{service_class}.Configurations",
+            ),
+        )
+    )
+
+    return ServiceSnapshot(
+        service_class=service_class,
+        display_name=display_name,
+        version="1.0.0",
+        metadata=metadata,
+    )
+
+
+def _get_enum_type(annotations: Dict[str, str]) -> Optional[Type[Enum]]:
+    if annotations.get("ni/type_specialization") != "enum":
+        return None
+    return cast(Type[Enum], Enum("FunctionEnum", json.loads(annotations["ni/enum.values"])))
+
+
+def _get_default_value(parameter: ParameterMetadata) -> Any:
+    if parameter.enum_type is not None:
+        return parameter.enum_type(parameter.default_value)
+    return parameter.default_value
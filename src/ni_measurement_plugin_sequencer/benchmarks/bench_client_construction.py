@@ -0,0 +1,70 @@
+"""Measures the time taken to create generated measurement plug-in clients.
+
+Compares creating the clients directly with creating them through a client session, which
+shares its connections between the clients.
+
+Run from the sequencer package directory:
+
+    poetry run python benchmarks/bench_client_construction.py --clients 20 --repeat 50
+"""
+
+import argparse
+import importlib
+import pathlib
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, List
+
+from _synthetic import create_service_snapshots
+
+from ni_measurement_plugin_sequencer._helpers import create_client
+from ni_measurement_plugin_sequencer._snapshot import save_snapshot
+
+
+def _time_per_client(create: Callable[[Any], Any], client_classes: List[Any], repeat: int) -> float:
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        for client_class in client_classes:
+            create(client_class)
+    return (time.perf_counter() - start_time) / (repeat * len(client_classes))
+
+
+def main() -> None:
+    """Generate synthetic clients and time their construction."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=20, help="Number of client classes.")
+    parser.add_argument("--repeat", type=int, default=50, help="Clients created per class.")
+    parser.add_argument("--rounds", type=int, default=5, help="Number of timed rounds.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_path = pathlib.Path(directory) / "snapshot.json"
+        save_snapshot(snapshot_path, create_service_snapshots(args.clients))
+        create_client(pathlib.Path(directory), from_snapshot=snapshot_path)
+
+        sys.path.insert(0, directory)
+        clients_package = importlib.import_module("clients")
+        client_classes = []
+        for module_name, class_name in clients_package._CLIENT_CLASS_NAMES.items():
+            module = importlib.import_module(f"clients.{module_name}")
+            client_classes.append(getattr(module, class_name))
+
+        # Time the direct construction first, because the session patches the classes.
+        direct = [
+            _time_per_client(lambda cls: cls(), client_classes, args.repeat)
+            for _ in range(args.rounds)
+        ]
+        session = clients_package.session
+        shared = [
+            _time_per_client(session.create_client, client_classes, args.repeat)
+            for _ in range(args.rounds)
+        ]
+
+    print(f"Direct construction:  {statistics.median(direct) * 1e6:8.2f} us per client")
+    print(f"Session construction: {statistics.median(shared) * 1e6:8.2f} us per client")
+
+
+if __name__ == "__main__":
+    main()
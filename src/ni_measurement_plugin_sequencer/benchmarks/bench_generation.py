@@ -0,0 +1,253 @@
+"""Measures how the sequence generation scales with the number of measurement plug-ins.
+
+A local fake discovery service advertises the given numbers of synthetic measurement
+plug-ins, and each generation stage is reported with its wall time and its peak Python
+memory, followed by the size of the generated code. Peak memory is measured with
+tracemalloc in a separate run of each stage, so it does not slow down the timed run, and
+it only covers this process, not the worker processes started by --jobs.
+
+The startup stages time a new Python process that imports the generated clients package and
+creates its first client, or all its clients, which is the startup cost of a sequence.
+
+Run from the sequencer package directory:
+
+    poetry run python benchmarks/bench_generation.py --sizes 10 100 1000
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import pathlib
+import statistics
+import subprocess  # nosec: B404
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from _fake_services import FakeMeasurementServices
+from _synthetic import create_service_snapshots
+
+from ni_measurement_plugin_sequencer._helpers import (
+    analyze_functions_and_parameters,
+    configure_init_file,
+    create_client,
+    write_sequence_file,
+)
+from ni_measurement_plugin_sequencer._manifest import load_manifest
+from ni_measurement_plugin_sequencer._snapshot import ServiceSnapshot, save_snapshot
+
+
+class _StageResult(NamedTuple):
+    plug_ins: int
+    stage: str
+    wall_time: float
+    peak_memory: Optional[int]
+
+
+def _run_stage(
+    plug_ins: int, stage: str, function: Callable[[], Any], measure_memory: bool
+) -> _StageResult:
+    # The generation prints a line per client, which would dominate the timing at scale.
+    with contextlib.redirect_stdout(io.StringIO()):
+        start_time = time.perf_counter()
+        function()
+        wall_time = time.perf_counter() - start_time
+
+        peak_memory = None
+        if measure_memory:
+            tracemalloc.start()
+            try:
+                function()
+                _, peak_memory = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+    result = _StageResult(plug_ins, stage, wall_time, peak_memory)
+    memory = f"{peak_memory / 2**20:10.1f} MiB" if peak_memory is not None else ""
+    print(f"{plug_ins:>8} {stage:<34} {wall_time:10.3f} s {memory}")
+    return result
+
+
+def _run_startup_stage(
+    plug_ins: int, stage: str, user_directory: pathlib.Path, code: str, repeat: int = 3
+) -> _StageResult:
+    # Run a new process each time, so that nothing is already imported, and keep the median.
+    wall_times = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        subprocess.run(  # nosec: B603
+            [sys.executable, "-c", code], cwd=user_directory, check=True, capture_output=True
+        )
+        wall_times.append(time.perf_counter() - start_time)
+
+    result = _StageResult(plug_ins, stage, statistics.median(wall_times), None)
+    print(f"{plug_ins:>8} {stage:<34} {result.wall_time:10.3f} s")
+    return result
+
+
+def _check_clients(user_directory: pathlib.Path, plug_ins: int) -> None:
+    client_count = len(load_manifest(user_directory / "clients"))
+    if client_count != plug_ins:
+        raise RuntimeError(f"Only {client_count} of {plug_ins} clients were generated.")
+
+
+def _get_code_size(user_directory: pathlib.Path) -> Dict[str, int]:
+    files = list((user_directory / "clients").glob("*.py")) + [user_directory / "sequence.py"]
+    contents = [file.read_bytes() for file in files]
+    return {
+        "files": len(files),
+        "bytes": sum(len(content) for content in contents),
+        "lines": sum(content.count(b"\n") for content in contents),
+    }
+
+
+def _benchmark(
+    snapshots: List[ServiceSnapshot],
+    directory: pathlib.Path,
+    jobs: int,
+    live: bool,
+    measure_memory: bool,
+) -> Dict[str, Any]:
+    plug_ins = len(snapshots)
+    user_directory = directory / f"sequence_{plug_ins}"
+    user_directory.mkdir()
+    client_module_directory = user_directory / "clients"
+    results: List[_StageResult] = []
+
+    if live:
+        # The client generator runs in this process, so that it uses the fake discovery service.
+        with FakeMeasurementServices(snapshots):
+            results.append(
+                _run_stage(
+                    plug_ins,
+                    "create_client (live, --jobs 1)",
+                    lambda: create_client(user_directory),
+                    measure_memory,
+                )
+            )
+        _check_clients(user_directory, plug_ins)
+
+    snapshot_path = directory / f"snapshot_{plug_ins}.json"
+    with contextlib.redirect_stdout(io.StringIO()):
+        save_snapshot(snapshot_path, snapshots)
+    results.append(
+        _run_stage(
+            plug_ins,
+            f"create_client (snapshot, --jobs {jobs})",
+            lambda: create_client(user_directory, jobs=jobs, from_snapshot=snapshot_path),
+            measure_memory,
+        )
+    )
+    _check_clients(user_directory, plug_ins)
+
+    manifest_entries = list(load_manifest(client_module_directory).values())
+    class_names = [entry.class_name for entry in manifest_entries]
+    module_names = [entry.module_name for entry in manifest_entries]
+    client_files = [client_module_directory / f"{name}.py" for name in module_names]
+
+    results.append(
+        _run_stage(
+            plug_ins,
+            "analyze_functions_and_parameters",
+            lambda: [analyze_functions_and_parameters(file) for file in client_files],
+            measure_memory,
+        )
+    )
+    results.append(
+        _run_stage(
+            plug_ins,
+            "configure_init_file",
+            lambda: configure_init_file(client_module_directory, class_names, module_names),
+            measure_memory,
+        )
+    )
+    results.append(
+        _run_stage(
+            plug_ins,
+            "write_sequence_file",
+            lambda: write_sequence_file(client_files, user_directory, module_names),
+            measure_memory,
+        )
+    )
+
+    results.append(
+        _run_startup_stage(
+            plug_ins,
+            "startup (first client)",
+            user_directory,
+            f"import clients; clients.{module_names[0]}",
+        )
+    )
+    results.append(
+        _run_startup_stage(
+            plug_ins,
+            "startup (all clients)",
+            user_directory,
+            "import clients; [getattr(clients, name) for name in clients.__all__]",
+        )
+    )
+
+    code_size = _get_code_size(user_directory)
+    print(
+        f"{plug_ins:>8} {'generated code':<34} {code_size['files']} files, "
+        f"{code_size['lines']} lines, {code_size['bytes'] / 2**10:.1f} KiB"
+    )
+    return {
+        "plug_ins": plug_ins,
+        "stages": [result._asdict() for result in results],
+        "generated_code": code_size,
+    }
+
+
+def main() -> None:
+    """Run the generation benchmark for each number of measurement plug-ins."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10, 100, 1000],
+        help="Numbers of synthetic measurement plug-ins to generate clients for.",
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=1, help="Jobs used to generate the clients from snapshots."
+    )
+    parser.add_argument(
+        "--no-live",
+        dest="live",
+        action="store_false",
+        help="Skip the generation through the fake discovery and measurement services.",
+    )
+    parser.add_argument(
+        "--no-memory",
+        dest="measure_memory",
+        action="store_false",
+        help="Skip the peak memory measurement, which runs every stage a second time.",
+    )
+    parser.add_argument(
+        "--json", type=pathlib.Path, help="Write the results to this JSON file for comparison."
+    )
+    args = parser.parse_args()
+
+    print(f"{'plug-ins':>8} {'stage':<34} {'wall time':>12} {'peak memory':>14}")
+    reports = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            snapshots = create_service_snapshots(size)
+            reports.append(
+                _benchmark(
+                    snapshots, pathlib.Path(directory), args.jobs, args.live, args.measure_memory
+                )
+            )
+
+    if args.json is not None:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump({"python": sys.version, "results": reports}, file, indent=2)
+            file.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 """NI Measurement Plug-In Sequencer for Python."""
 
 import pathlib
+from typing import Optional
 
 import click
 
@@ -12,16 +13,72 @@ from ni_measurement_plugin_sequencer._helpers import create_client
     "directory_out",
     type=click.Path(exists=True, file_okay=False, dir_okay=True, writable=True, readable=True),
 )
-def create_sequence(directory_out: pathlib.Path) -> None:
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Maximum number of clients to generate in parallel.",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="Regenerate only the clients whose measurement service changed and keep sequence.py.",
+)
+@click.option(
+    "--save-snapshot",
+    type=click.Path(file_okay=True, dir_okay=False, writable=True, path_type=pathlib.Path),
+    help="Save the registered measurement services and their metadata to a snapshot file.",
+)
+@click.option(
+    "--from-snapshot",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=pathlib.Path),
+    help="Generate the clients from a snapshot file instead of the registered measurement services.",
+)
+@click.option(
+    "--resolution-cache-ttl",
+    type=click.FloatRange(min=0),
+    help="Reuse cached discovery results that are younger than the given number of seconds.",
+)
+@click.option(
+    "--step-graph",
+    is_flag=True,
+    help="Write sequence.py as steps with dependencies that run concurrently.",
+)
+def create_sequence(
+    directory_out: pathlib.Path,
+    jobs: int,
+    incremental: bool,
+    save_snapshot: Optional[pathlib.Path],
+    from_snapshot: Optional[pathlib.Path],
+    resolution_cache_ttl: Optional[float],
+    step_graph: bool,
+) -> None:
     """Creates a sequence by generating clients using the ni-measurement-plugin-client-generator.
 
     Args:
         directory_out: Path to the directory where sequence files are stored.
+        jobs: Maximum number of clients to generate in parallel.
+        incremental: Whether to regenerate only the clients that changed since the last run.
+        save_snapshot: Path to a snapshot file to save the measurement services' metadata to.
+        from_snapshot: Path to a snapshot file to generate the clients from, without
+            contacting the discovery service or the measurement services.
+        resolution_cache_ttl: Time-to-live of the discovery resolution cache, in seconds.
+        step_graph: Whether to write sequence.py as steps with dependencies.
 
     Raises:
         click.ClickException: An unexpected error occurred during client creation.
     """
     try:
-        create_client(directory_out)
+        create_client(
+            directory_out,
+            jobs=jobs,
+            incremental=incremental,
+            from_snapshot=from_snapshot,
+            save_snapshot_path=save_snapshot,
+            resolution_cache_ttl=resolution_cache_ttl,
+            step_graph=step_graph,
+        )
     except Exception as e:
         raise click.ClickException(f"An unexpected error occurred: {e}")
@@ -2,4 +2,5 @@
 
 from ni_measurement_plugin_sequencer import create_sequence
 
-create_sequence()
+if __name__ == "__main__":
+    create_sequence()
@@ -0,0 +1,6 @@
+"""Support modules that are copied into the generated clients package.
+
+Each module in this package is copied as-is next to the generated clients, so the
+modules must only depend on the standard library, the measurement plug-in service SDK
+and each other.
+"""
@@ -0,0 +1,170 @@
+"""Asyncio measurement plug-in clients built on grpc.aio."""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import threading
+import weakref
+from typing import Any, AsyncIterator, Dict, Generic, List, Optional, TypeVar
+
+import grpc
+import grpc.aio
+from ni_measurement_plugin_sdk_service._internal.stubs.ni.measurementlink.measurement.v2 import (
+    measurement_service_pb2_grpc as v2_measurement_service_pb2_grpc,
+)
+
+# The support modules are copied into the generated clients package, so they import each
+# other relatively.
+from ._resolution_cache import invalidate_measurement_service  # noqa: I252
+
+_logger = logging.getLogger(__name__)
+
+_V2_MEASUREMENT_SERVICE_INTERFACE = "ni.measurementlink.measurement.v2.MeasurementService"
+
+_T = TypeVar("_T")
+
+
+class AsyncChannelPool:
+    """Shares the grpc.aio channels to the same address between the async clients.
+
+    A grpc.aio channel can only be used by the event loop that created it, so the channels
+    are kept per event loop, and released when the event loop is garbage collected.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty channel pool."""
+        self._lock = threading.Lock()
+        self._channels: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, Dict[str, grpc.aio.Channel]
+        ] = weakref.WeakKeyDictionary()
+
+    def get_channel(self, address: str) -> grpc.aio.Channel:
+        """Get the channel to the given address for the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            channels = self._channels.setdefault(loop, {})
+            channel = channels.get(address)
+            if channel is None:
+                channel = grpc.aio.insecure_channel(address)
+                channels[address] = channel
+        return channel
+
+    async def close(self) -> None:
+        """Close the channels of the running event loop."""
+        with self._lock:
+            channels = self._channels.pop(asyncio.get_running_loop(), {})
+        for channel in channels.values():
+            await channel.close()
+
+
+class AsyncMeasurementClient(Generic[_T]):
+    """Measures with a generated measurement plug-in client from an asyncio event loop.
+
+    The async client builds its requests and reads its outputs with the configuration and
+    output metadata of a generated client, and sends them through a grpc.aio channel, so
+    one event loop can make many measurements at the same time without threads. Unlike the
+    generated client, an async client can make several measurements at the same time. The
+    measure and stream_measure methods take the same parameters as those of the generated
+    client, and canceling the task that awaits a measurement cancels the measurement.
+    """
+
+    def __init__(self, client: _T, channel_pool: AsyncChannelPool) -> None:
+        """Initialize the async client.
+
+        Args:
+            client: The generated client whose metadata, pin map context and discovery
+                client are used.
+
+            channel_pool: The pool of the grpc.aio channels.
+        """
+        self._client = client
+        self._channel_pool = channel_pool
+        self._signature = inspect.signature(getattr(type(client), "measure"))
+        self._address: Optional[str] = None
+
+    @property
+    def client(self) -> _T:
+        """The generated client whose metadata is used."""
+        return self._client
+
+    @property
+    def pin_map_context(self) -> Any:
+        """The pin map context for the measurement."""
+        return getattr(self._client, "pin_map_context")
+
+    @pin_map_context.setter
+    def pin_map_context(self, val: Any) -> None:
+        setattr(self._client, "pin_map_context", val)
+
+    @property
+    def sites(self) -> Optional[List[int]]:
+        """The sites where the measurement must be executed."""
+        return getattr(self._client, "sites")
+
+    @sites.setter
+    def sites(self, val: List[int]) -> None:
+        setattr(self._client, "sites", val)
+
+    async def measure(self, *args: Any, **kwargs: Any) -> Any:
+        """Perform a single measurement.
+
+        Returns:
+            Measurement outputs.
+        """
+        result = None
+        async for response in self.stream_measure(*args, **kwargs):
+            result = response
+        return result
+
+    async def stream_measure(self, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        """Perform a streaming measurement.
+
+        Returns:
+            Stream of measurement outputs. If the generated client cannot deserialize the
+            responses, the Measure responses are returned instead.
+        """
+        # Bind the parameters like the generated measure method, which passes their values
+        # to the request in the order of its signature.
+        parameters = self._signature.bind(self._client, *args, **kwargs)
+        parameters.apply_defaults()
+        parameter_values = list(parameters.arguments.values())[1:]
+        request = getattr(self._client, "_create_measure_request")(parameter_values)
+        deserialize_response = getattr(self._client, "_deserialize_response", None)
+
+        address = await self._get_address()
+        stub = v2_measurement_service_pb2_grpc.MeasurementServiceStub(
+            self._channel_pool.get_channel(address)
+        )
+        call = stub.Measure(request)
+        try:
+            async for response in call:
+                yield deserialize_response(response) if deserialize_response else response
+        except grpc.RpcError as e:
+            if e.code() == grpc.StatusCode.CANCELLED:
+                _logger.debug("The measurement is canceled.")
+            elif e.code() == grpc.StatusCode.UNAVAILABLE and invalidate_measurement_service(
+                getattr(self._client, "_get_discovery_client")(),
+                getattr(self._client, "_service_class"),
+                getattr(self._client, "_version"),
+            ):
+                # The service may have been restarted at another address.
+                if self._address == address:
+                    self._address = None
+            raise
+        finally:
+            # Cancel the call if the task was canceled or the stream was closed early.
+            call.cancel()
+
+    async def _get_address(self) -> str:
+        if self._address is None:
+            # Resolving the service is a blocking call to the discovery service.
+            service_location = await asyncio.to_thread(
+                getattr(self._client, "_get_discovery_client")().resolve_service,
+                provided_interface=_V2_MEASUREMENT_SERVICE_INTERFACE,
+                service_class=getattr(self._client, "_service_class"),
+                version=getattr(self._client, "_version"),
+            )
+            self._address = service_location.insecure_address
+        return self._address
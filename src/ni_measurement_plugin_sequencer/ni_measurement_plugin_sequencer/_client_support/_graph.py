@@ -0,0 +1,216 @@
+"""Runs the steps of a sequence concurrently, in the order of their dependencies."""
+
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Union,
+)
+
+_logger = logging.getLogger(__name__)
+
+StepResults = Mapping[str, Any]
+
+
+class Step(NamedTuple):
+    """A measurement of a sequence, and the steps that it depends on.
+
+    The parameters are passed to the measure method of the client. They can also be a
+    function that takes the outputs of the completed steps, keyed by step name, and returns
+    the parameters. The step runs after the steps it depends on, and is skipped if its
+    condition returns False for the outputs of the completed steps, or if a step it depends
+    on was skipped.
+    """
+
+    name: str
+    client: Any
+    parameters: Union[Mapping[str, Any], Callable[[StepResults], Mapping[str, Any]]] = {}
+    depends_on: Sequence[str] = ()
+    condition: Optional[Callable[[StepResults], bool]] = None
+
+
+class StepTiming(NamedTuple):
+    """When a step started and ended, in seconds since the start of the sequence."""
+
+    start: float
+    end: float
+
+
+class SequenceRun(NamedTuple):
+    """The outcome of running the steps of a sequence.
+
+    The critical path is the chain of dependent steps that determined the duration of the
+    sequence: each step of the path started when the previous one ended. Shortening a step
+    outside of the critical path does not shorten the sequence.
+    """
+
+    outputs: Dict[str, Any]
+    skipped: List[str]
+    timings: Dict[str, StepTiming]
+    critical_path: List[str]
+    duration: float
+
+
+def run_steps(steps: Sequence[Step], max_workers: Optional[int] = None) -> SequenceRun:
+    """Run the steps of a sequence, running the independent steps concurrently.
+
+    A step starts as soon as the steps it depends on have completed, unless another step
+    that uses the same client is running, since a client makes one measurement at a time.
+    If a step fails, no other step is started, and the failure is raised once the running
+    steps have ended.
+
+    Args:
+        steps: The steps of the sequence.
+
+        max_workers: The maximum number of steps running at the same time. By default,
+            all the independent steps can run at the same time.
+
+    Returns:
+        The outputs of the completed steps, the skipped steps, the timing of each step and
+        the critical path of the sequence.
+
+    Raises:
+        ValueError: If two steps have the same name, a step depends on an unknown step, or
+            the dependencies form a cycle.
+    """
+    steps_by_name = _validate_steps(steps)
+    outputs: Dict[str, Any] = {}
+    skipped: List[str] = []
+    timings: Dict[str, StepTiming] = {}
+    pending = list(steps_by_name)
+    running: Dict[Future, Step] = {}
+    busy_clients: Set[int] = set()
+    error: Optional[BaseException] = None
+    start_time = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max_workers or max(len(steps), 1)) as executor:
+        while pending or running:
+            if error is None:
+                for name in list(pending):
+                    step = steps_by_name[name]
+                    if not all(
+                        dependency in outputs or dependency in skipped
+                        for dependency in step.depends_on
+                    ):
+                        continue
+                    if any(dependency in skipped for dependency in step.depends_on) or (
+                        step.condition is not None and not step.condition(outputs)
+                    ):
+                        pending.remove(name)
+                        skipped.append(name)
+                        _logger.info("Skipped the step '%s'.", name)
+                        continue
+                    if id(step.client) in busy_clients:
+                        continue
+                    pending.remove(name)
+                    busy_clients.add(id(step.client))
+                    parameters = (
+                        step.parameters(outputs) if callable(step.parameters) else step.parameters
+                    )
+                    running[executor.submit(_run_step, step.client, parameters, start_time)] = step
+            if not running:
+                if error is not None:
+                    break
+                # Skipping steps can make the following steps ready, so check them again.
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                step = running.pop(future)
+                busy_clients.discard(id(step.client))
+                try:
+                    outputs[step.name], timings[step.name] = future.result()
+                except Exception as e:
+                    _logger.warning("The step '%s' failed: %s", step.name, e)
+                    if error is None:
+                        error = e
+
+    if error is not None:
+        raise error
+    duration = time.perf_counter() - start_time
+    critical_path = _get_critical_path(steps_by_name, timings)
+    _logger.info(
+        "The sequence took %.1f ms. Critical path: %s.",
+        duration * 1000,
+        " -> ".join(critical_path),
+    )
+    return SequenceRun(outputs, skipped, timings, critical_path, duration)
+
+
+def _run_step(client: Any, parameters: Mapping[str, Any], start_time: float) -> Any:
+    step_start = time.perf_counter() - start_time
+    result = client.measure(**parameters)
+    return result, StepTiming(step_start, time.perf_counter() - start_time)
+
+
+def _validate_steps(steps: Sequence[Step]) -> Dict[str, Step]:
+    steps_by_name: Dict[str, Step] = {}
+    for step in steps:
+        if step.name in steps_by_name:
+            raise ValueError(f"More than one step is named '{step.name}'.")
+        steps_by_name[step.name] = step
+    for step in steps:
+        for dependency in step.depends_on:
+            if dependency not in steps_by_name:
+                raise ValueError(
+                    f"The step '{step.name}' depends on an unknown step '{dependency}'."
+                )
+
+    # Visit the steps in dependency order to detect cycles.
+    visited: Set[str] = set()
+    visiting: Set[str] = set()
+
+    def _visit(name: str) -> None:
+        if name in visited:
+            return
+        if name in visiting:
+            raise ValueError(f"The dependencies of the step '{name}' form a cycle.")
+        visiting.add(name)
+        for dependency in steps_by_name[name].depends_on:
+            _visit(dependency)
+        visiting.remove(name)
+        visited.add(name)
+
+    for name in steps_by_name:
+        _visit(name)
+    return steps_by_name
+
+
+def _get_critical_path(
+    steps_by_name: Mapping[str, Step], timings: Mapping[str, StepTiming]
+) -> List[str]:
+    if not timings:
+        return []
+    # Walk back from the last step to end, through the step that ended last among those that
+    # delayed it: the steps it depends on, and the steps that used its client before it.
+    name: Optional[str] = max(timings, key=lambda step_name: timings[step_name].end)
+    path: List[str] = []
+    while name is not None:
+        path.append(name)
+        step = steps_by_name[name]
+        predecessors = [
+            other_name
+            for other_name, timing in timings.items()
+            if other_name != name
+            and (
+                other_name in step.depends_on
+                or (
+                    steps_by_name[other_name].client is step.client
+                    and timing.end <= timings[name].start
+                )
+            )
+        ]
+        name = max(predecessors, key=lambda step_name: timings[step_name].end, default=None)
+    path.reverse()
+    return path
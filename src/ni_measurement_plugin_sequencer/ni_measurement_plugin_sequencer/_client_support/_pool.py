@@ -0,0 +1,156 @@
+"""A bounded pool of clients of one measurement plug-in."""
+
+from __future__ import annotations
+
+import contextlib
+import threading
+from typing import Any, Callable, Generator, Generic, Iterator, List, Optional, TypeVar
+
+_T = TypeVar("_T")
+
+
+class ClientPool(Generic[_T]):
+    """Lends the clients of one measurement plug-in to concurrent callers.
+
+    A generated client makes one measurement at a time. The pool creates up to max_size
+    clients on demand, lends an idle client to each measurement and takes it back when the
+    measurement ends, so many threads can measure with the same plug-in without creating a
+    client per measurement. The measure and stream_measure methods of the pool take the same
+    parameters as those of the clients.
+    """
+
+    def __init__(self, create_client: Callable[[], _T], max_size: int) -> None:
+        """Initialize the client pool and create its first client.
+
+        Args:
+            create_client: Creates a client, for example with the connections of a session.
+
+            max_size: The maximum number of clients in the pool.
+
+        Raises:
+            ValueError: If the maximum size is less than 1.
+        """
+        if max_size < 1:
+            raise ValueError("The maximum size of a client pool must be at least 1.")
+        self._create_client = create_client
+        self._max_size = max_size
+        self._condition = threading.Condition()
+        first_client = create_client()
+        self._clients: List[_T] = [first_client]
+        self._idle_clients: List[_T] = [first_client]
+        self._creating_count = 0
+        self._pin_map_context = getattr(first_client, "pin_map_context")
+
+    @property
+    def max_size(self) -> int:
+        """The maximum number of clients in the pool."""
+        return self._max_size
+
+    @property
+    def clients(self) -> List[_T]:
+        """The clients created by the pool so far."""
+        with self._condition:
+            return list(self._clients)
+
+    @property
+    def pin_map_context(self) -> Any:
+        """The pin map context of the clients of the pool."""
+        return self._pin_map_context
+
+    @pin_map_context.setter
+    def pin_map_context(self, val: Any) -> None:
+        with self._condition:
+            self._pin_map_context = val
+            for client in self._clients:
+                setattr(client, "pin_map_context", val)
+
+    @property
+    def sites(self) -> Optional[List[int]]:
+        """The sites where the measurements of the pool are executed."""
+        return self._pin_map_context.sites
+
+    @sites.setter
+    def sites(self, val: List[int]) -> None:
+        self.pin_map_context = self._pin_map_context._replace(sites=val)
+
+    def checkout(self, timeout: Optional[float] = None) -> _T:
+        """Take an idle client from the pool, or create one if none is idle and there is room.
+
+        Args:
+            timeout: The maximum time to wait for a client, in seconds, or None to wait
+                without limit.
+
+        Returns:
+            A client that is not used by any other caller until it is checked in.
+
+        Raises:
+            TimeoutError: If no client became available before the timeout.
+        """
+        with self._condition:
+            if not self._condition.wait_for(self._can_checkout, timeout):
+                raise TimeoutError("No client of the pool became available before the timeout.")
+            if self._idle_clients:
+                return self._idle_clients.pop()
+            # Count the client while it is created, so that the pool does not exceed its size.
+            self._creating_count += 1
+
+        try:
+            client = self._create_client()
+        except BaseException:
+            with self._condition:
+                self._creating_count -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._creating_count -= 1
+            setattr(client, "pin_map_context", self._pin_map_context)
+            self._clients.append(client)
+        return client
+
+    def _can_checkout(self) -> bool:
+        return bool(self._idle_clients) or (
+            len(self._clients) + self._creating_count < self._max_size
+        )
+
+    def checkin(self, client: _T) -> None:
+        """Return a client taken from the pool, so that other callers can use it."""
+        with self._condition:
+            self._idle_clients.append(client)
+            self._condition.notify()
+
+    @contextlib.contextmanager
+    def client(self, timeout: Optional[float] = None) -> Iterator[_T]:
+        """Take a client from the pool for the duration of a with statement.
+
+        Args:
+            timeout: The maximum time to wait for a client, in seconds, or None to wait
+                without limit.
+
+        Raises:
+            TimeoutError: If no client became available before the timeout.
+        """
+        client = self.checkout(timeout)
+        try:
+            yield client
+        finally:
+            self.checkin(client)
+
+    def measure(self, *args: Any, **kwargs: Any) -> Any:
+        """Perform a single measurement with an idle client of the pool.
+
+        Returns:
+            Measurement outputs.
+        """
+        with self.client() as client:
+            return getattr(client, "measure")(*args, **kwargs)
+
+    def stream_measure(self, *args: Any, **kwargs: Any) -> Generator[Any, None, None]:
+        """Perform a streaming measurement with an idle client of the pool.
+
+        The client is returned to the pool when the stream ends or is closed.
+
+        Returns:
+            Stream of measurement outputs.
+        """
+        with self.client() as client:
+            yield from getattr(client, "stream_measure")(*args, **kwargs)
@@ -0,0 +1,331 @@
+"""An on-disk cache of service resolutions made through the discovery service."""
+
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import os
+import pathlib
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple, TypeVar
+
+import grpc
+from ni_measurement_plugin_sdk_service.discovery import DiscoveryClient, ServiceLocation
+from ni_measurement_plugin_sdk_service.grpc.channelpool import GrpcChannelPool
+from ni_measurement_plugin_sdk_service.measurement.info import ServiceInfo
+
+_logger = logging.getLogger(__name__)
+
+_V2_MEASUREMENT_SERVICE_INTERFACE = "ni.measurementlink.measurement.v2.MeasurementService"
+
+_T = TypeVar("_T")
+
+_CACHE_FORMAT_VERSION = 1
+DEFAULT_CACHE_PATH = (
+    pathlib.Path(os.environ.get("LOCALAPPDATA") or pathlib.Path.home() / ".cache")
+    / "ni_measurement_plugin_sequencer"
+    / "resolution_cache.json"
+)
+DEFAULT_TIME_TO_LIVE = 600.0
+
+
+class ResolutionCache:
+    """Stores service resolutions in a file so that they can be reused by later processes.
+
+    The entries are keyed by provided interface, service class, deployment target and
+    version, and expire after the time-to-live. An entry should be invalidated when a
+    connection to the cached location fails, so that the service is resolved again.
+    """
+
+    def __init__(
+        self,
+        path: pathlib.Path = DEFAULT_CACHE_PATH,
+        time_to_live: float = DEFAULT_TIME_TO_LIVE,
+    ) -> None:
+        """Initialize the resolution cache.
+
+        Args:
+            path: The path of the cache file.
+
+            time_to_live: The time after which a cached resolution expires, in seconds.
+        """
+        self._path = path
+        self._time_to_live = time_to_live
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+
+    @property
+    def path(self) -> pathlib.Path:
+        """The path of the cache file."""
+        return self._path
+
+    def get(self, key: Tuple[str, ...]) -> Optional[Dict[str, Any]]:
+        """Get the cached value for the given key, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._get_entries().get(_format_key(key))
+        if entry is None or entry["expires"] < time.time():
+            return None
+        return entry["value"]
+
+    def set(self, key: Tuple[str, ...], value: Dict[str, Any]) -> None:
+        """Cache the value for the given key and save the cache file."""
+        with self._lock:
+            self._get_entries()[_format_key(key)] = {
+                "expires": time.time() + self._time_to_live,
+                "value": value,
+            }
+            self._save()
+
+    def invalidate(self, key: Tuple[str, ...]) -> None:
+        """Remove the cached value for the given key, if any."""
+        with self._lock:
+            if self._get_entries().pop(_format_key(key), None) is not None:
+                self._save()
+
+    def clear(self) -> None:
+        """Remove all the cached values."""
+        with self._lock:
+            self._entries = {}
+            self._save()
+
+    def _get_entries(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            self._entries = self._load()
+        return self._entries
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self._path, "r", encoding="utf-8") as file:
+                cache = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        if cache.get("format_version") != _CACHE_FORMAT_VERSION:
+            return {}
+        now = time.time()
+        return {
+            key: entry for key, entry in cache.get("entries", {}).items() if entry["expires"] >= now
+        }
+
+    def _save(self) -> None:
+        # Write to a temporary file and replace the cache file, so that other processes
+        # never read a partially written cache.
+        cache = {"format_version": _CACHE_FORMAT_VERSION, "entries": self._entries}
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            file_descriptor, temporary_path = tempfile.mkstemp(
+                dir=self._path.parent, prefix=self._path.name, suffix=".tmp"
+            )
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as file:
+                json.dump(cache, file)
+            os.replace(temporary_path, self._path)
+        except OSError as e:
+            _logger.warning("Could not save the resolution cache to '%s': %s", self._path, e)
+
+
+class CachingDiscoveryClient(DiscoveryClient):
+    """A discovery client that reuses service resolutions from a resolution cache.
+
+    Without a cache, this behaves exactly like the discovery client. The cache can be set
+    after the client is shared with measurement plug-in clients.
+    """
+
+    def __init__(
+        self,
+        *,
+        grpc_channel_pool: Optional[GrpcChannelPool] = None,
+        cache: Optional[ResolutionCache] = None,
+    ) -> None:
+        """Initialize the caching discovery client.
+
+        Args:
+            grpc_channel_pool: An optional gRPC channel pool (recommended).
+
+            cache: An optional resolution cache. If not specified, nothing is cached.
+        """
+        super().__init__(grpc_channel_pool=grpc_channel_pool)
+        self.cache = cache
+
+    def resolve_service(
+        self,
+        provided_interface: str,
+        service_class: str = "",
+        deployment_target: str = "",
+        version: str = "",
+    ) -> ServiceLocation:
+        """Resolve the location of a service, using the cached location if available."""
+        if self.cache is None:
+            return super().resolve_service(
+                provided_interface, service_class, deployment_target, version
+            )
+        key = ("resolve", provided_interface, service_class, deployment_target, version)
+        cached_value = self.cache.get(key)
+        if cached_value is not None:
+            return ServiceLocation(**cached_value["service_location"])
+
+        service_location = super().resolve_service(
+            provided_interface, service_class, deployment_target, version
+        )
+        self.cache.set(key, {"service_location": service_location._asdict()})
+        return service_location
+
+    def resolve_service_with_information(
+        self,
+        provided_interface: str,
+        service_class: str = "",
+        deployment_target: str = "",
+        version: str = "",
+    ) -> Tuple[ServiceLocation, ServiceInfo]:
+        """Resolve the location and information of a service, using the cache if available."""
+        if self.cache is None:
+            return super().resolve_service_with_information(
+                provided_interface, service_class, deployment_target, version
+            )
+        key = (
+            "resolve_with_information",
+            provided_interface,
+            service_class,
+            deployment_target,
+            version,
+        )
+        cached_value = self.cache.get(key)
+        if cached_value is not None:
+            return (
+                ServiceLocation(**cached_value["service_location"]),
+                ServiceInfo(**cached_value["service_info"]),
+            )
+
+        service_location, service_info = super().resolve_service_with_information(
+            provided_interface, service_class, deployment_target, version
+        )
+        self.cache.set(
+            key,
+            {
+                "service_location": service_location._asdict(),
+                "service_info": service_info._asdict(),
+            },
+        )
+        return service_location, service_info
+
+    def enumerate_services(self, provided_interface: str) -> Sequence[ServiceInfo]:
+        """Enumerate the services for the provided interface, using the cache if available."""
+        if self.cache is None:
+            return super().enumerate_services(provided_interface)
+        key = ("enumerate", provided_interface)
+        cached_value = self.cache.get(key)
+        if cached_value is not None:
+            return [ServiceInfo(**service_info) for service_info in cached_value["services"]]
+
+        services = super().enumerate_services(provided_interface)
+        self.cache.set(key, {"services": [service_info._asdict() for service_info in services]})
+        return services
+
+    def invalidate(
+        self,
+        provided_interface: str,
+        service_class: str = "",
+        deployment_target: str = "",
+        version: str = "",
+    ) -> None:
+        """Remove the cached resolutions of a service, for example after a connection failure."""
+        if self.cache is None:
+            return
+        for method in ("resolve", "resolve_with_information"):
+            self.cache.invalidate(
+                (method, provided_interface, service_class, deployment_target, version)
+            )
+
+
+def invalidate_measurement_service(
+    discovery_client: DiscoveryClient, service_class: str, version: str = ""
+) -> bool:
+    """Remove the cached resolutions of a measurement service, if resolutions are cached.
+
+    Args:
+        discovery_client: The discovery client that resolved the measurement service.
+
+        service_class: The service class of the measurement service.
+
+        version: The version of the measurement service.
+
+    Returns:
+        Whether the discovery client caches its resolutions, in which case the measurement
+        service should be resolved again.
+    """
+    if not isinstance(discovery_client, CachingDiscoveryClient) or discovery_client.cache is None:
+        return False
+    discovery_client.invalidate(
+        _V2_MEASUREMENT_SERVICE_INTERFACE, service_class=service_class, version=version
+    )
+    return True
+
+
+def invalidate_on_unavailable(client_class: _T) -> _T:
+    """Make the generated client class resolve its service again after it becomes unavailable.
+
+    When a measurement fails because its measurement service is unavailable, the cached
+    resolution of the service is discarded and the client resolves the service again for
+    its next measurement, since the service may have been restarted at another address.
+
+    Args:
+        client_class: The generated measurement plug-in client class.
+
+    Returns:
+        The same client class.
+    """
+    get_stub = getattr(client_class, "_get_stub")
+    if getattr(get_stub, "_invalidates_on_unavailable", False):
+        return client_class
+
+    @functools.wraps(get_stub)
+    def _get_stub(self: Any) -> Any:
+        return _InvalidatingStub(self, get_stub(self))
+
+    setattr(_get_stub, "_invalidates_on_unavailable", True)
+    setattr(client_class, "_get_stub", _get_stub)
+    return client_class
+
+
+class _InvalidatingStub:
+    def __init__(self, client: Any, stub: Any) -> None:
+        self._client = client
+        self._stub = stub
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stub, name)
+
+    def Measure(self, *args: Any, **kwargs: Any) -> _InvalidatingCall:  # noqa: N802
+        return _InvalidatingCall(self._client, self._stub, self._stub.Measure(*args, **kwargs))
+
+
+class _InvalidatingCall:
+    def __init__(self, client: Any, stub: Any, call: Any) -> None:
+        self._client = client
+        self._stub = stub
+        self._call = call
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._call, name)
+
+    def __iter__(self) -> Iterator[Any]:
+        return self
+
+    def __next__(self) -> Any:
+        try:
+            return next(self._call)
+        except grpc.RpcError as e:
+            if e.code() == grpc.StatusCode.UNAVAILABLE and invalidate_measurement_service(
+                self._client._get_discovery_client(),
+                self._client._service_class,
+                self._client._version,
+            ):
+                # Only forget the stub if the client did not already replace it.
+                if self._client._stub is self._stub:
+                    self._client._stub = None
+            raise
+
+
+def _format_key(key: Tuple[str, ...]) -> str:
+    return "|".join(key)
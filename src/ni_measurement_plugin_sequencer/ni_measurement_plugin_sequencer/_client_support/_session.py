@@ -0,0 +1,394 @@
+"""Connections shared by all the measurement plug-in clients of a sequence."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import pathlib
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+    Union,
+)
+
+import grpc
+from ni_measurement_plugin_sdk_service._internal.stubs.ni.measurementlink.measurement.v2 import (
+    measurement_service_pb2 as v2_measurement_service_pb2,
+    measurement_service_pb2_grpc as v2_measurement_service_pb2_grpc,
+)
+from ni_measurement_plugin_sdk_service.discovery import DiscoveryClient
+from ni_measurement_plugin_sdk_service.grpc.channelpool import GrpcChannelPool
+from ni_measurement_plugin_sdk_service.pin_map import PinMapClient
+
+# The support modules are copied into the generated clients package, so they import each
+# other relatively.
+from ._aio import AsyncChannelPool, AsyncMeasurementClient  # noqa: I252
+from ._pool import ClientPool  # noqa: I252
+from ._resolution_cache import (  # noqa: I252
+    CachingDiscoveryClient,
+    DEFAULT_CACHE_PATH,
+    DEFAULT_TIME_TO_LIVE,
+    invalidate_measurement_service,
+    invalidate_on_unavailable,
+    ResolutionCache,
+)
+from ._sites import SiteExecutor  # noqa: I252
+
+_logger = logging.getLogger(__name__)
+
+_V2_MEASUREMENT_SERVICE_INTERFACE = "ni.measurementlink.measurement.v2.MeasurementService"
+
+_T = TypeVar("_T")
+
+
+class WarmUpResult(NamedTuple):
+    """The outcome of connecting a client to its measurement service.
+
+    The latency is the time taken to resolve and connect to the measurement service, in
+    seconds. The error is None if the client connected successfully.
+    """
+
+    service_class: str
+    latency: float
+    error: Optional[Exception]
+
+
+class _RegisteredPinMap(NamedTuple):
+    modified_time: int
+    content_hash: str
+    pin_map_id: str
+
+
+class ClientSession:
+    """Shares one gRPC channel pool, discovery client and pin map client between clients.
+
+    Clients created by the same session resolve services through the same discovery
+    client and reuse the gRPC channels to the same hosts, so the connection setup is
+    paid once per process instead of once per client.
+    """
+
+    def __init__(
+        self,
+        *,
+        grpc_channel_pool: Optional[GrpcChannelPool] = None,
+        discovery_client: Optional[DiscoveryClient] = None,
+        pin_map_client: Optional[PinMapClient] = None,
+    ) -> None:
+        """Initialize the client session.
+
+        Args:
+            grpc_channel_pool: An optional gRPC channel pool.
+
+            discovery_client: An optional discovery client. If not specified, a discovery
+                client that supports a resolution cache is created.
+
+            pin_map_client: An optional pin map client.
+        """
+        self._grpc_channel_pool = grpc_channel_pool or GrpcChannelPool()
+        self._discovery_client = discovery_client or CachingDiscoveryClient(
+            grpc_channel_pool=self._grpc_channel_pool
+        )
+        self._pin_map_client = pin_map_client or PinMapClient(
+            discovery_client=self._discovery_client,
+            grpc_channel_pool=self._grpc_channel_pool,
+        )
+        self._async_channel_pool = AsyncChannelPool()
+        self._pin_map_lock = threading.Lock()
+        self._registered_pin_maps: Dict[pathlib.Path, _RegisteredPinMap] = {}
+
+    def __enter__(self) -> ClientSession:
+        """Enter the runtime context of the client session."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        traceback: Optional[types.TracebackType],
+    ) -> None:
+        """Exit the runtime context of the client session."""
+        self.close()
+
+    @property
+    def grpc_channel_pool(self) -> GrpcChannelPool:
+        """The gRPC channel pool shared by the clients."""
+        return self._grpc_channel_pool
+
+    @property
+    def discovery_client(self) -> DiscoveryClient:
+        """The discovery client shared by the clients."""
+        return self._discovery_client
+
+    @property
+    def pin_map_client(self) -> PinMapClient:
+        """The pin map client shared by the clients."""
+        return self._pin_map_client
+
+    @property
+    def async_channel_pool(self) -> AsyncChannelPool:
+        """The pool of the grpc.aio channels shared by the async clients."""
+        return self._async_channel_pool
+
+    def enable_resolution_cache(
+        self,
+        path: pathlib.Path = DEFAULT_CACHE_PATH,
+        time_to_live: float = DEFAULT_TIME_TO_LIVE,
+    ) -> None:
+        """Reuse the service resolutions of previous runs that have not expired.
+
+        The clients of the session resolve their measurement services from the cache file
+        instead of the discovery service. A cached resolution is discarded when connecting
+        to the service fails during warm-up, or when a measurement fails because the service
+        is unavailable.
+
+        Args:
+            path: The path of the cache file.
+
+            time_to_live: The time after which a cached resolution expires, in seconds.
+
+        Raises:
+            TypeError: If the session was created with a discovery client that does not
+                support a resolution cache.
+        """
+        if not isinstance(self._discovery_client, CachingDiscoveryClient):
+            raise TypeError(
+                "The resolution cache requires the session to create its own discovery client."
+            )
+        self._discovery_client.cache = ResolutionCache(path, time_to_live)
+
+    def create_client(self, client_class: Callable[..., _T], **kwargs: Any) -> _T:
+        """Create a measurement plug-in client that uses the connections of this session.
+
+        If the resolution cache is enabled, the client resolves its service again after a
+        measurement fails because the service is unavailable.
+
+        Args:
+            client_class: The generated measurement plug-in client class.
+
+            kwargs: Additional keyword arguments to pass to the client constructor.
+
+        Returns:
+            The measurement plug-in client.
+        """
+        invalidate_on_unavailable(client_class)
+        return client_class(
+            discovery_client=self._discovery_client,
+            pin_map_client=self._pin_map_client,
+            grpc_channel_pool=self._grpc_channel_pool,
+            **kwargs,
+        )
+
+    def create_async_client(
+        self,
+        client_class: Callable[..., _T],
+        async_client_class: Callable[..., AsyncMeasurementClient[_T]] = AsyncMeasurementClient,
+        **kwargs: Any,
+    ) -> AsyncMeasurementClient[_T]:
+        """Create an asyncio client for a measurement plug-in.
+
+        The async client uses the metadata of a generated client created with the
+        connections of this session, and shares the grpc.aio channels of the session with
+        the other async clients. Register the pin map with the async client like with a
+        client, for example with ``session.register_pin_map(pin_map_path, [async_client])``.
+
+        Args:
+            client_class: The generated measurement plug-in client class.
+
+            async_client_class: The class of the async client, such as a subclass of
+                AsyncMeasurementClient.
+
+            kwargs: Additional keyword arguments to pass to the client constructor.
+
+        Returns:
+            The async client.
+        """
+        return async_client_class(
+            self.create_client(client_class, **kwargs), self._async_channel_pool
+        )
+
+    def create_client_pool(
+        self, client_class: Callable[..., _T], max_size: int = 8, **kwargs: Any
+    ) -> ClientPool[_T]:
+        """Create a pool of clients that lets several threads measure with the same plug-in.
+
+        The clients of the pool are created on demand with the connections of this session.
+        Register the pin map with the pool like with a client, for example with
+        ``session.register_pin_map(pin_map_path, [client_pool])``.
+
+        Args:
+            client_class: The generated measurement plug-in client class.
+
+            max_size: The maximum number of clients in the pool, which is the maximum number
+                of concurrent measurements.
+
+            kwargs: Additional keyword arguments to pass to the client constructor.
+
+        Returns:
+            The client pool.
+        """
+        return ClientPool(lambda: self.create_client(client_class, **kwargs), max_size)
+
+    def create_site_executor(
+        self,
+        client_class: Callable[..., _T],
+        sites: Sequence[int],
+        *,
+        max_workers: Optional[int] = None,
+        **kwargs: Any,
+    ) -> SiteExecutor[_T]:
+        """Create a site executor that measures the given sites concurrently.
+
+        A client is created for each site with the connections of this session, and its
+        sites are set to that site only. Register the pin map with the clients of the
+        executor before measuring, for example with
+        ``session.register_pin_map(pin_map_path, site_executor.clients)``.
+
+        Args:
+            client_class: The generated measurement plug-in client class.
+
+            sites: The sites to measure.
+
+            max_workers: The maximum number of sites measured at the same time. By default,
+                all the sites are measured at the same time.
+
+            kwargs: Additional keyword arguments to pass to the client constructor.
+
+        Returns:
+            The site executor.
+        """
+        site_clients: Dict[int, _T] = {}
+        for site in sites:
+            client = self.create_client(client_class, **kwargs)
+            setattr(client, "sites", [site])
+            site_clients[site] = client
+        return SiteExecutor(site_clients, max_workers)
+
+    def register_pin_map(
+        self, pin_map_path: Union[str, pathlib.Path], clients: Sequence[Any]
+    ) -> str:
+        """Register the pin map once and use it with all the given clients.
+
+        The pin map is uploaded to the pin map service only if it was not already
+        registered by this session, or if its content changed since it was registered.
+
+        Args:
+            pin_map_path: Path of the pin map file.
+
+            clients: The measurement plug-in clients that use the pin map.
+
+        Returns:
+            The ID of the registered pin map.
+        """
+        path = pathlib.Path(pin_map_path).resolve()
+        modified_time = path.stat().st_mtime_ns
+        with self._pin_map_lock:
+            registered_pin_map = self._registered_pin_maps.get(path)
+            if registered_pin_map is None or registered_pin_map.modified_time != modified_time:
+                content_hash = hashlib.sha256(path.read_bytes()).hexdigest()
+                if registered_pin_map is None or registered_pin_map.content_hash != content_hash:
+                    pin_map_id = self._pin_map_client.update_pin_map(path)
+                else:
+                    pin_map_id = registered_pin_map.pin_map_id
+                registered_pin_map = _RegisteredPinMap(modified_time, content_hash, pin_map_id)
+                self._registered_pin_maps[path] = registered_pin_map
+
+        for client in clients:
+            client.pin_map_context = client.pin_map_context._replace(
+                pin_map_id=registered_pin_map.pin_map_id
+            )
+        return registered_pin_map.pin_map_id
+
+    def warm_up(self, clients: Sequence[Any], timeout: float = 30.0) -> List[WarmUpResult]:
+        """Resolve and connect the given clients to their measurement services concurrently.
+
+        Calling this before the first step of a sequence moves the service resolution,
+        channel creation and connection handshake of every client out of the first
+        measurement.
+
+        Args:
+            clients: The measurement plug-in clients created by this session.
+
+            timeout: The maximum time to wait for each connection to be ready, in seconds.
+
+        Returns:
+            The result of connecting each client, in the order of the given clients. A client
+            that fails to connect is reported with an error instead of raising, so that the
+            failure is raised by its first measurement.
+        """
+        if not clients:
+            return []
+
+        with ThreadPoolExecutor(max_workers=len(clients)) as executor:
+            results = list(executor.map(lambda client: self._connect(client, timeout), clients))
+
+        for result in results:
+            if result.error is None:
+                _logger.info(
+                    "Connected to '%s' in %.1f ms.", result.service_class, result.latency * 1000
+                )
+            else:
+                _logger.warning("Could not connect to '%s': %s", result.service_class, result.error)
+        return results
+
+    def _connect(self, client: Any, timeout: float) -> WarmUpResult:
+        start_time = time.perf_counter()
+        try:
+            try:
+                # A cached location may be stale, so do not wait for a connection to it.
+                channel = self._resolve_and_connect(
+                    client, timeout, fail_fast=self._is_resolution_cached()
+                )
+            except Exception:
+                if not invalidate_measurement_service(
+                    self._discovery_client, client._service_class, client._version
+                ):
+                    raise
+                channel = self._resolve_and_connect(client, timeout, fail_fast=False)
+            with client._initialization_lock:
+                if client._stub is None:
+                    client._stub = v2_measurement_service_pb2_grpc.MeasurementServiceStub(channel)
+        except Exception as e:
+            return WarmUpResult(client._service_class, time.perf_counter() - start_time, e)
+        return WarmUpResult(client._service_class, time.perf_counter() - start_time, None)
+
+    def _resolve_and_connect(self, client: Any, timeout: float, fail_fast: bool) -> grpc.Channel:
+        service_location = self._discovery_client.resolve_service(
+            provided_interface=_V2_MEASUREMENT_SERVICE_INTERFACE,
+            service_class=client._service_class,
+            version=client._version,
+        )
+        channel = self._grpc_channel_pool.get_channel(service_location.insecure_address)
+        if fail_fast:
+            # Unlike waiting for the channel to be ready, a request fails as soon as the
+            # connection fails.
+            v2_measurement_service_pb2_grpc.MeasurementServiceStub(channel).GetMetadata(
+                v2_measurement_service_pb2.GetMetadataRequest(), timeout=timeout
+            )
+        else:
+            ready_future = grpc.channel_ready_future(channel)
+            try:
+                ready_future.result(timeout=timeout)
+            finally:
+                ready_future.cancel()
+        return channel
+
+    def _is_resolution_cached(self) -> bool:
+        return (
+            isinstance(self._discovery_client, CachingDiscoveryClient)
+            and self._discovery_client.cache is not None
+        )
+
+    def close(self) -> None:
+        """Close the gRPC channels of the session."""
+        self._grpc_channel_pool.close()
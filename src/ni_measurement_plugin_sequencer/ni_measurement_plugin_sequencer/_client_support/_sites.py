@@ -0,0 +1,136 @@
+"""Measures several sites concurrently with one client per site."""
+
+from __future__ import annotations
+
+import functools
+import logging
+import types
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Any, Dict, Generic, List, Mapping, Optional, Type, TypeVar
+
+import grpc
+
+_logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+class SiteExecutor(Generic[_T]):
+    """Runs the measurement of a plug-in on several sites concurrently.
+
+    A generated client makes one measurement at a time, so the sites measured with a single
+    client run one after another. The site executor owns one client per site, created with
+    the connections of a session and limited to its site, and calls measure on all of them
+    from a thread pool.
+    """
+
+    def __init__(self, clients: Mapping[int, _T], max_workers: Optional[int] = None) -> None:
+        """Initialize the site executor.
+
+        Args:
+            clients: The client of each site, whose sites are already set to that site.
+
+            max_workers: The maximum number of sites measured at the same time. By default,
+                all the sites are measured at the same time.
+
+        Raises:
+            ValueError: If no client is given.
+        """
+        if not clients:
+            raise ValueError("A site executor requires at least one site.")
+        self._clients = dict(clients)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or len(self._clients), thread_name_prefix="site"
+        )
+
+    def __enter__(self) -> SiteExecutor[_T]:
+        """Enter the runtime context of the site executor."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        traceback: Optional[types.TracebackType],
+    ) -> None:
+        """Exit the runtime context of the site executor."""
+        self.close()
+
+    @property
+    def sites(self) -> List[int]:
+        """The sites measured by the executor."""
+        return list(self._clients)
+
+    @property
+    def clients(self) -> List[_T]:
+        """The client of each site, in the order of the sites."""
+        return list(self._clients.values())
+
+    def get_client(self, site: int) -> _T:
+        """Get the client that measures the given site."""
+        return self._clients[site]
+
+    def measure(self, *args: Any, **kwargs: Any) -> Dict[int, Any]:
+        """Measure all the sites concurrently with the same parameters.
+
+        If the measurement of a site fails, the measurements of the other sites are
+        canceled, including those waiting for a thread, and the first failure, in the
+        order of the sites, is raised once every measurement has ended.
+
+        Args:
+            args: The positional parameters of the measure method of the clients.
+
+            kwargs: The keyword parameters of the measure method of the clients.
+
+        Returns:
+            The outputs of each site, in the order of the sites.
+        """
+        futures: Dict[int, Future] = {
+            site: self._executor.submit(getattr(client, "measure"), *args, **kwargs)
+            for site, client in self._clients.items()
+        }
+        cancel_on_failure = functools.partial(self._cancel_on_failure, list(futures.values()))
+        for future in futures.values():
+            future.add_done_callback(cancel_on_failure)
+
+        outputs: Dict[int, Any] = {}
+        error: Optional[BaseException] = None
+        for site, future in futures.items():
+            try:
+                outputs[site] = future.result()
+            except CancelledError:
+                pass
+            except grpc.RpcError as e:
+                if error is None and e.code() != grpc.StatusCode.CANCELLED:
+                    error = e
+            except Exception as e:
+                if error is None:
+                    error = e
+        if error is not None:
+            raise error
+        if len(outputs) != len(futures):
+            raise RuntimeError("The measurements of the sites were canceled.")
+        return outputs
+
+    def cancel(self) -> None:
+        """Cancel the active measurements of all the sites."""
+        for client in self._clients.values():
+            getattr(client, "cancel")()
+
+    def _cancel_on_failure(self, futures: List[Future], future: Future) -> None:
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None and not (
+            isinstance(error, grpc.RpcError) and error.code() == grpc.StatusCode.CANCELLED
+        ):
+            _logger.debug("Canceling the other sites after a failure: %s", error)
+            # Cancel the measurements that have not started before those that are active,
+            # so that no measurement starts after the active ones are canceled.
+            for pending_future in futures:
+                pending_future.cancel()
+            self.cancel()
+
+    def close(self) -> None:
+        """Wait for the active measurements and stop the threads of the executor."""
+        self._executor.shutdown(wait=True)
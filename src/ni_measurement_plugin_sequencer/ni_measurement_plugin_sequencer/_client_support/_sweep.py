@@ -0,0 +1,115 @@
+"""Runs a measurement over a grid of parameter values and collects the outputs as arrays."""
+
+from __future__ import annotations
+
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from typing import Any, Dict, List, Mapping, NamedTuple, Sequence
+
+# The support modules are copied into the generated clients package, so they import each
+# other relatively.
+from ._pool import ClientPool  # noqa: I252
+
+
+class SweepResult(NamedTuple):
+    """The outputs of a measurement over a grid of parameter values.
+
+    The parameters contain the values of each swept parameter, in the order of the grid.
+    The outputs contain an array per field of the measurement outputs, whose first
+    dimensions are the lengths of the swept parameters, so outputs[field][i, j] is the
+    output of the measurement with the i-th value of the first parameter and the j-th value
+    of the second. A repeated field whose values have the same length at every point adds
+    a last dimension; otherwise the array contains the values as objects.
+    """
+
+    parameters: Dict[str, Any]
+    outputs: Dict[str, Any]
+    duration: float
+
+
+def run_sweep(client: Any, grid: Mapping[str, Sequence[Any]], **parameters: Any) -> SweepResult:
+    """Measure every combination of the given parameter values.
+
+    The measurements are pipelined: with a client pool, up to the maximum size of the pool
+    run at the same time, and the next measurement starts as soon as one ends.
+
+    Args:
+        client: A generated client, or a client pool to measure several points at the same
+            time. Register the pin map with it before the sweep.
+
+        grid: The values of each swept parameter of the measure method, such as
+            ``{"voltage_level": numpy.linspace(0.0, 5.0, 101)}``.
+
+        parameters: The parameters of the measure method that are the same at every point.
+
+    Returns:
+        The values of the swept parameters and the outputs as NumPy arrays, shaped by the
+        grid.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+        ValueError: If a parameter is both swept and fixed, or the grid is empty.
+    """
+    import numpy
+
+    if not grid:
+        raise ValueError("The grid must contain at least one swept parameter.")
+    fixed_and_swept = set(grid) & set(parameters)
+    if fixed_and_swept:
+        raise ValueError(f"The parameters {sorted(fixed_and_swept)} are both swept and fixed.")
+
+    names = list(grid)
+    values = [list(grid[name]) for name in names]
+    shape = tuple(len(parameter_values) for parameter_values in values)
+    max_workers = client.max_size if isinstance(client, ClientPool) else 1
+
+    def _measure(point: Sequence[Any]) -> Any:
+        return client.measure(**parameters, **dict(zip(names, point)))
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_measure, point) for point in itertools.product(*values)]
+        try:
+            results = [future.result() for future in futures]
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    duration = time.perf_counter() - start_time
+
+    outputs: Dict[str, Any] = {}
+    fields: Sequence[str] = getattr(results[0], "_fields", ()) if results else ()
+    for field_index, field in enumerate(fields):
+        outputs[field] = _to_array(
+            numpy, [_to_value(result[field_index]) for result in results], shape
+        )
+    return SweepResult(
+        {name: numpy.asarray(parameter_values) for name, parameter_values in zip(names, values)},
+        outputs,
+        duration,
+    )
+
+
+def _to_value(value: Any) -> Any:
+    # Store enums by value, so that their arrays are numeric.
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (list, tuple)) and value and isinstance(value[0], Enum):
+        return [element.value for element in value]
+    return value
+
+
+def _to_array(numpy: Any, values: List[Any], shape: Sequence[int]) -> Any:
+    try:
+        array = numpy.array(values)
+    except ValueError:
+        # The values of a repeated field have different lengths.
+        array = None
+    if array is None or array.dtype == object:
+        array = numpy.empty(len(values), dtype=object)
+        for index, value in enumerate(values):
+            array[index] = value
+        return array.reshape(shape)
+    return array.reshape(tuple(shape) + array.shape[1:])
@@ -1,13 +1,41 @@
 import ast
+import contextlib
+import io
+import multiprocessing
+import os
 import pathlib
 import re
-from typing import Any, Dict, List, Optional, Tuple
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
 
 import click
-import ni_measurement_plugin_sdk_generator.client
-import ni_measurement_plugin_sdk_generator.client.templates
+import grpc
 from mako.template import Template
+from ni_measurement_plugin_sdk_service._internal.stubs.ni.measurementlink.measurement.v2 import (
+    measurement_service_pb2 as v2_measurement_service_pb2,
+    measurement_service_pb2_grpc as v2_measurement_service_pb2_grpc,
+)
 from ni_measurement_plugin_sdk_service.discovery import DiscoveryClient
+from ni_measurement_plugin_sdk_service.grpc.channelpool import GrpcChannelPool
+
+from ni_measurement_plugin_sequencer._client_support._resolution_cache import (
+    CachingDiscoveryClient,
+    ResolutionCache,
+)
+from ni_measurement_plugin_sequencer._manifest import (
+    compute_metadata_hash,
+    get_generator_version,
+    load_manifest,
+    ManifestEntry,
+    save_manifest,
+)
+from ni_measurement_plugin_sequencer._snapshot import (
+    create_client_from_snapshot,
+    load_snapshot,
+    save_snapshot,
+    ServiceSnapshot,
+)
 
 _V2_MEASUREMENT_SERVICE_INTERFACE = "ni.measurementlink.measurement.v2.MeasurementService"
 # List of regex patterns to convert camel case to snake case
@@ -17,6 +45,20 @@ _CAMEL_TO_SNAKE_CASE_REGEXES = [
     re.compile("([0-9])([^_0-9])"),
     re.compile("([^_0-9])([0-9])"),
 ]
+_CLIENT_SUPPORT_DIRECTORY = pathlib.Path(__file__).parent / "_client_support"
+# Starting a worker process imports the client generator, which takes as long as generating a
+# few clients, so a worker process is only started for at least this many clients.
+_MIN_CLIENTS_PER_WORKER = 10
+
+
+class _ClientGenerationResult(NamedTuple):
+    """The outcome of generating a single measurement plug-in client."""
+
+    service_class: str
+    class_name: str
+    module_name: str
+    error: Optional[str]
+    output: str
 
 
 def _get_function_parameters(node: ast.FunctionDef) -> Dict[str, str]:
@@ -110,6 +152,179 @@ def _delete_file(file_path: pathlib.Path) -> None:
         file_path.unlink(missing_ok=True)
 
 
+def _generate_client(
+    snapshot: ServiceSnapshot,
+    client_module_directory: pathlib.Path,
+    class_name: str,
+    module_name: str,
+) -> _ClientGenerationResult:
+    """Generates a single client and reports whether the generation succeeded.
+
+    The client is generated from the metadata in the snapshot, which was either queried
+    from the measurement service or loaded from a snapshot file, so the measurement service
+    is not contacted again. This runs either in-process or in a worker process, so it must
+    not raise. The output of the generation is returned instead of printed, so that the
+    outputs of the worker processes are not interleaved.
+    """
+    error: Optional[str] = None
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            create_client_from_snapshot(snapshot, client_module_directory, class_name, module_name)
+    except SystemExit as e:
+        if e.code != 0:
+            error = f"Client generator exited with code {e.code}."
+    except Exception as e:
+        error = f"Exception thrown from client generation: {e}"
+
+    return _ClientGenerationResult(
+        snapshot.service_class, class_name, module_name, error, output.getvalue()
+    )
+
+
+def _print_outputs(results: Iterable[_ClientGenerationResult]) -> List[_ClientGenerationResult]:
+    """Prints the output of each client generation as it ends, in the order of the clients."""
+    printed_results = []
+    for result in results:
+        print(result.output, end="")
+        printed_results.append(result)
+    return printed_results
+
+
+def _generate_clients(
+    entries: List[ManifestEntry],
+    client_module_directory: pathlib.Path,
+    jobs: int,
+    snapshots: Dict[str, ServiceSnapshot],
+) -> List[_ClientGenerationResult]:
+    """Generates clients for the given manifest entries, optionally in parallel.
+
+    The results are returned in the order of the given entries, regardless of the
+    order in which the clients finish generating. The clients are generated from the
+    snapshots of their measurement services. Worker processes are only used when there
+    are enough clients for each of them, and never more than the number of processors.
+    """
+    generation_args = [
+        (
+            snapshots[entry.service_class],
+            client_module_directory,
+            entry.class_name,
+            entry.module_name,
+        )
+        for entry in entries
+    ]
+
+    workers = min(jobs, os.cpu_count() or 1, len(generation_args) // _MIN_CLIENTS_PER_WORKER)
+    if workers <= 1:
+        return _print_outputs(_generate_client(*args) for args in generation_args)
+
+    # Use "spawn" so that worker processes do not inherit the gRPC state of this process.
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+        return _print_outputs(
+            executor.map(
+                _generate_client,
+                *zip(*generation_args),
+                chunksize=max(1, len(generation_args) // (workers * 4)),
+            )
+        )
+
+
+def _get_service_snapshot(
+    discovery_client: DiscoveryClient,
+    channel_pool: GrpcChannelPool,
+    service_class: str,
+) -> ServiceSnapshot:
+    """Queries the information and metadata of a registered measurement service."""
+    service_location, service_info = discovery_client.resolve_service_with_information(
+        _V2_MEASUREMENT_SERVICE_INTERFACE, service_class
+    )
+    stub = v2_measurement_service_pb2_grpc.MeasurementServiceStub(
+        channel_pool.get_channel(service_location.insecure_address)
+    )
+    metadata = stub.GetMetadata(v2_measurement_service_pb2.GetMetadataRequest())
+
+    return ServiceSnapshot(
+        service_class=service_class,
+        display_name=service_info.display_name,
+        version=service_info.versions[0] if service_info.versions else "",
+        metadata=metadata,
+    )
+
+
+def _get_service_snapshots(
+    resolution_cache: Optional[ResolutionCache] = None,
+) -> List[ServiceSnapshot]:
+    """Queries the information and metadata of all registered measurement services."""
+    snapshots: List[ServiceSnapshot] = []
+    with GrpcChannelPool() as channel_pool:
+        discovery_client = CachingDiscoveryClient(
+            grpc_channel_pool=channel_pool, cache=resolution_cache
+        )
+        available_measurement_services = discovery_client.enumerate_services(
+            _V2_MEASUREMENT_SERVICE_INTERFACE
+        )
+
+        for measurement in available_measurement_services:
+            try:
+                try:
+                    snapshot = _get_service_snapshot(
+                        discovery_client, channel_pool, measurement.service_class
+                    )
+                except grpc.RpcError:
+                    if resolution_cache is None:
+                        raise
+                    # The cached location may be stale, so resolve the service again.
+                    discovery_client.invalidate(
+                        _V2_MEASUREMENT_SERVICE_INTERFACE, measurement.service_class
+                    )
+                    snapshot = _get_service_snapshot(
+                        discovery_client, channel_pool, measurement.service_class
+                    )
+                snapshots.append(snapshot)
+            except Exception as e:
+                print(
+                    f"Warning: Client creation failed for '{measurement.service_class}'. "
+                    f"Could not get the measurement metadata: {e}"
+                )
+    return snapshots
+
+
+def _create_manifest_entry(snapshot: ServiceSnapshot, generator_version: str) -> ManifestEntry:
+    """Creates a manifest entry that identifies the client generated for a measurement service."""
+    base_service_class = _extract_base_service_class(snapshot.service_class)
+    return ManifestEntry(
+        service_class=snapshot.service_class,
+        version=snapshot.version,
+        metadata_hash=compute_metadata_hash(snapshot.metadata),
+        generator_version=generator_version,
+        class_name=_create_class_name(base_service_class),
+        module_name=_create_module_name(base_service_class),
+    )
+
+
+def _remove_stale_clients(
+    client_module_directory: pathlib.Path,
+    previous_entries: Dict[str, ManifestEntry],
+    current_entries: Dict[str, ManifestEntry],
+) -> None:
+    """Deletes clients whose measurement service is no longer registered or was renamed."""
+    for service_class, previous_entry in previous_entries.items():
+        current_entry = current_entries.get(service_class)
+        if current_entry is None or current_entry.module_name != previous_entry.module_name:
+            _delete_file(client_module_directory / f"{previous_entry.module_name}.py")
+            print(f"Removed the stale client for '{service_class}'.")
+
+
+def _copy_client_support_modules(client_module_directory: pathlib.Path) -> None:
+    """Copies the support modules used by the generated clients package."""
+    for support_module_path in _CLIENT_SUPPORT_DIRECTORY.glob("_*.py"):
+        if support_module_path.name != "__init__.py":
+            shutil.copyfile(support_module_path, client_module_directory / support_module_path.name)
+
+
 def _render_template(template_name: str, **template_args: Any) -> bytes:
     """Renders the Mako template and returns the output as bytes."""
     template_file_path = str(pathlib.Path(__file__).parent / "templates" / template_name)
@@ -201,38 +416,76 @@ def configure_init_file(
     """Configure the __init__.py file for the client module.
 
     This method creates or updates the __init__.py file in the client module
-    directory by importing the necessary class names from their respective modules.
+    directory. The generated package imports each client module and creates its
+    client only when the client is first accessed, so that a sequence only pays
+    for the clients that it uses.
 
     Args:
         client_module_directory: The directory where the client module is located.
-        list_of_class_names: List of class names to be imported in the __init__.py file.
+        list_of_class_names: List of class names to be exposed by the __init__.py file.
         list_of_module_names: List of module names corresponding to the class names.
 
     Raises:
         FileNotFoundError: If the client module directory does not exist.
     """
-    init_content: List[str] = []
-
-    for module_name, class_name in zip(list_of_module_names, list_of_class_names):
-        init_content.append(f"from clients.{module_name} import {class_name}")
-    init_content.append("")
-
-    for module_name, class_name in zip(list_of_module_names, list_of_class_names):
-        init_content.append(f"{module_name} = {class_name}()")
+    try:
+        rendered_content = _render_template(
+            "clients_init.py.mako",
+            class_names=list_of_class_names,
+            module_names=list_of_module_names,
+        )
+    except Exception as e:
+        raise click.ClickException(f"An error occurred while rendering the template: {str(e)}")
 
-    init_file_text: str = "\n".join(init_content)
     init_file_path = client_module_directory / "__init__.py"
 
-    with open(init_file_path, "w") as init_file:
-        init_file.write(init_file_text)
+    with open(init_file_path, "wb") as init_file:
+        init_file.write(rendered_content)
 
     print(f"__init__.py file has been created at: {init_file_path}")
 
 
+def configure_async_clients_file(
+    client_module_directory: pathlib.Path,
+    list_of_class_names: List[str],
+    list_of_module_names: List[str],
+) -> None:
+    """Configure the aio.py file for the client module.
+
+    This method creates or updates the aio.py file in the client module directory. The
+    generated module exposes an asyncio client for each measurement plug-in, which uses the
+    metadata of the generated client and measures through grpc.aio.
+
+    Args:
+        client_module_directory: The directory where the client module is located.
+        list_of_class_names: List of class names of the generated clients.
+        list_of_module_names: List of module names corresponding to the class names.
+
+    Raises:
+        FileNotFoundError: If the client module directory does not exist.
+    """
+    try:
+        rendered_content = _render_template(
+            "clients_aio.py.mako",
+            class_names=list_of_class_names,
+            module_names=list_of_module_names,
+        )
+    except Exception as e:
+        raise click.ClickException(f"An error occurred while rendering the template: {str(e)}")
+
+    aio_file_path = client_module_directory / "aio.py"
+
+    with open(aio_file_path, "wb") as aio_file:
+        aio_file.write(rendered_content)
+
+    print(f"aio.py file has been created at: {aio_file_path}")
+
+
 def write_sequence_file(
     list_of_client_directories: List[pathlib.Path],
     user_directory: pathlib.Path,
     list_of_module_names: List[str],
+    step_graph: bool = False,
 ) -> None:
     """Write a sequence file based on client directories and class names.
 
@@ -245,10 +498,15 @@ def write_sequence_file(
         user_directory: The path to the user directory where the sequence.py
                         file will be written.
         list_of_module_names: List of module names to be included in the sequence file.
+        step_graph: Whether to write the sequence as steps with dependencies, which are run
+                    concurrently by the step scheduler, instead of a script.
 
     Raises:
         FileNotFoundError: If the provided directory paths do not exist.
+        click.ClickException: If no client directory is provided.
     """
+    if not list_of_client_directories:
+        raise click.ClickException("The sequence file requires at least one client.")
     methods, _ = analyze_functions_and_parameters(
         list_of_client_directories[0]
     )  # assuming all clients have the same methods
@@ -257,10 +515,19 @@ def write_sequence_file(
         file_path=user_directory / "sequence.py",
         instance_names=[client for client in list_of_module_names],
         callables=pinmap_methods,
+        step_graph=step_graph,
     )
 
 
-def create_client(target_path: Optional[pathlib.Path] = None) -> None:
+def create_client(
+    target_path: Optional[pathlib.Path] = None,
+    jobs: int = 1,
+    incremental: bool = False,
+    from_snapshot: Optional[pathlib.Path] = None,
+    save_snapshot_path: Optional[pathlib.Path] = None,
+    resolution_cache_ttl: Optional[float] = None,
+    step_graph: bool = False,
+) -> None:
     """Create a client and generate the required configuration files.
 
     This method creates a client by generating necessary files, configuring
@@ -269,10 +536,25 @@ def create_client(target_path: Optional[pathlib.Path] = None) -> None:
     Args:
         target_path: The target directory for the client creation. If not specified,
                      the current working directory will be used.
+        jobs: The maximum number of clients to generate in parallel, in worker processes.
+              Worker processes are only used if there are at least 10 clients per worker.
+        incremental: Whether to regenerate only the clients whose measurement service
+                     changed since the last run, as recorded in the clients manifest. The
+                     existing sequence.py file is kept.
+        from_snapshot: The path of a snapshot file to generate the clients from, instead of
+                       querying the discovery service and the measurement services.
+        save_snapshot_path: The path of a snapshot file to save the measurement services and
+                            their metadata to, so that the clients can be generated offline.
+        resolution_cache_ttl: The time-to-live of the discovery resolution cache, in seconds.
+                              If not specified, the measurement services are enumerated and
+                              resolved through the discovery service without caching.
+        step_graph: Whether to write the sequence file as steps with dependencies, which are
+                    run concurrently by the step scheduler, instead of a script.
 
     Raises:
         FileNotFoundError: If the target directory does not exist.
-        Exception: If client generation fails for any reason.
+        click.ClickException: If a service class is not a valid client name, or if no
+                              client could be generated.
     """
     user_directory = pathlib.Path(target_path if target_path is not None else pathlib.Path.cwd())
     client_module_directory = user_directory / "clients"
@@ -284,44 +566,101 @@ def create_client(target_path: Optional[pathlib.Path] = None) -> None:
     list_of_class_names: List[str] = []
     list_of_module_names: List[str] = []
 
-    discovery_client = DiscoveryClient()
-    available_measurement_services = discovery_client.enumerate_services(
-        _V2_MEASUREMENT_SERVICE_INTERFACE
-    )
+    if from_snapshot is not None:
+        snapshots = load_snapshot(from_snapshot)
+    else:
+        snapshots = _get_service_snapshots(
+            ResolutionCache(time_to_live=resolution_cache_ttl)
+            if resolution_cache_ttl is not None
+            else None
+        )
 
-    clean_up(user_directory=user_directory)
-
-    for measurement in available_measurement_services:
-        base_service_class = _extract_base_service_class(measurement.service_class)
-        class_name = _create_class_name(base_service_class)
-        module_name = _create_module_name(base_service_class)
-        args = [
-            f"-s{measurement.service_class}",
-            f"-o{client_module_directory}",
-            f"-c{class_name}",
-            f"-m{module_name}",
-        ]
-        try:
-            ni_measurement_plugin_sdk_generator.client.create_client(args=args)
-        except SystemExit as e:
-            if e.code != 0:
+    if save_snapshot_path is not None:
+        save_snapshot(save_snapshot_path, snapshots)
+
+    generator_version = get_generator_version()
+    current_entries: Dict[str, ManifestEntry] = {
+        snapshot.service_class: _create_manifest_entry(snapshot, generator_version)
+        for snapshot in snapshots
+    }
+
+    previous_entries = load_manifest(client_module_directory) if incremental else {}
+    if incremental:
+        _remove_stale_clients(client_module_directory, previous_entries, current_entries)
+    else:
+        clean_up(user_directory=user_directory)
+
+    entries_to_generate = [
+        entry
+        for service_class, entry in current_entries.items()
+        if previous_entries.get(service_class) != entry
+        or not (client_module_directory / f"{entry.module_name}.py").is_file()
+    ]
+    if incremental:
+        print(
+            f"{len(entries_to_generate)} of {len(current_entries)} clients need to be regenerated."
+        )
+
+    results = _generate_clients(
+        entries=entries_to_generate,
+        client_module_directory=client_module_directory,
+        jobs=jobs,
+        snapshots={snapshot.service_class: snapshot for snapshot in snapshots},
+    )
+    failed_service_classes = set()
+    for result in results:
+        if result.error is not None:
+            print(f"Warning: Client creation failed for '{result.service_class}'. {result.error}")
+            failed_service_classes.add(result.service_class)
+
+    manifest_entries: List[ManifestEntry] = []
+    for service_class, entry in current_entries.items():
+        if service_class in failed_service_classes:
+            # Keep the previously generated client, if any, until it can be regenerated.
+            previous_entry = previous_entries.get(service_class)
+            if (
+                previous_entry is None
+                or previous_entry.module_name != entry.module_name
+                or not (client_module_directory / f"{entry.module_name}.py").is_file()
+            ):
                 continue
-        except Exception as e:
-            raise Exception("Exception thrown from client generation: ", e)
+            print(f"Keeping the previously generated client for '{service_class}'.")
+            entry = previous_entry
+
+        manifest_entries.append(entry)
+        list_of_client_directories.append(client_module_directory / f"{entry.module_name}.py")
+        list_of_class_names.append(entry.class_name)
+        list_of_module_names.append(entry.module_name)
+
+    if not list_of_client_directories:
+        if not current_entries:
+            raise click.ClickException("No registered measurement services were found.")
+        raise click.ClickException(
+            "Client creation failed for all the measurement services. See the warnings above."
+        )
 
-        client_directory = client_module_directory / f"{module_name}.py"
-        list_of_client_directories.append(client_directory)
-        list_of_class_names.append(class_name)
-        list_of_module_names.append(module_name)
+    save_manifest(client_module_directory, manifest_entries)
 
+    _copy_client_support_modules(client_module_directory)
     configure_init_file(
         client_module_directory=client_module_directory,
         list_of_class_names=list_of_class_names,
         list_of_module_names=list_of_module_names,
     )
+    configure_async_clients_file(
+        client_module_directory=client_module_directory,
+        list_of_class_names=list_of_class_names,
+        list_of_module_names=list_of_module_names,
+    )
+
+    sequence_file_path = user_directory / "sequence.py"
+    if incremental and sequence_file_path.exists():
+        print(f"Keeping the existing sequence file at {sequence_file_path}")
+        return
 
     write_sequence_file(
         list_of_client_directories=list_of_client_directories,
         list_of_module_names=list_of_module_names,
         user_directory=user_directory,
+        step_graph=step_graph,
     )
@@ -0,0 +1,85 @@
+"""Tracks the generated clients so that they can be regenerated incrementally."""
+
+import hashlib
+import importlib.metadata
+import json
+import pathlib
+from typing import Dict, List, NamedTuple
+
+from ni_measurement_plugin_sdk_service._internal.stubs.ni.measurementlink.measurement.v2 import (
+    measurement_service_pb2 as v2_measurement_service_pb2,
+)
+
+MANIFEST_FILE_NAME = ".manifest.json"
+_MANIFEST_FORMAT_VERSION = 1
+
+
+class ManifestEntry(NamedTuple):
+    """Describes the measurement service that a generated client was created from."""
+
+    service_class: str
+    version: str
+    metadata_hash: str
+    generator_version: str
+    class_name: str
+    module_name: str
+
+
+def get_generator_version() -> str:
+    """Returns the installed version of the measurement plug-in client generator."""
+    try:
+        return importlib.metadata.version("ni-measurement-plugin-sdk-generator")
+    except importlib.metadata.PackageNotFoundError:
+        return ""
+
+
+def compute_metadata_hash(metadata: v2_measurement_service_pb2.GetMetadataResponse) -> str:
+    """Computes a stable hash of the metadata returned by a measurement service."""
+    return hashlib.sha256(metadata.SerializeToString(deterministic=True)).hexdigest()
+
+
+def load_manifest(client_module_directory: pathlib.Path) -> Dict[str, ManifestEntry]:
+    """Loads the manifest from the clients directory.
+
+    Args:
+        client_module_directory: The directory containing the generated clients.
+
+    Returns:
+        The manifest entries keyed by service class. If the manifest does not exist or
+        cannot be read, an empty dictionary is returned so that every client is regenerated.
+    """
+    manifest_path = client_module_directory / MANIFEST_FILE_NAME
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+    if manifest.get("format_version") != _MANIFEST_FORMAT_VERSION:
+        return {}
+
+    entries: Dict[str, ManifestEntry] = {}
+    for client in manifest.get("clients", []):
+        try:
+            entry = ManifestEntry(**client)
+        except TypeError:
+            continue
+        entries[entry.service_class] = entry
+    return entries
+
+
+def save_manifest(client_module_directory: pathlib.Path, entries: List[ManifestEntry]) -> None:
+    """Saves the manifest to the clients directory.
+
+    Args:
+        client_module_directory: The directory containing the generated clients.
+        entries: The manifest entries, in the order in which the clients were generated.
+    """
+    manifest = {
+        "format_version": _MANIFEST_FORMAT_VERSION,
+        "clients": [entry._asdict() for entry in entries],
+    }
+    manifest_path = client_module_directory / MANIFEST_FILE_NAME
+    with open(manifest_path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+        file.write("\n")
@@ -0,0 +1,151 @@
+"""Captures measurement service metadata so that clients can be generated offline."""
+
+import base64
+import json
+import pathlib
+from enum import Enum
+from typing import Dict, List, NamedTuple, Type
+
+import ni_measurement_plugin_sdk_generator.client
+from ni_measurement_plugin_sdk_generator.client._support import (
+    get_configuration_and_output_metadata_by_index,
+    get_configuration_parameters_with_type_and_default_values,
+    get_output_parameters_with_type,
+    to_ordered_set,
+)
+from ni_measurement_plugin_sdk_service._internal.stubs.ni.measurementlink.measurement.v2 import (
+    measurement_service_pb2 as v2_measurement_service_pb2,
+)
+
+_SNAPSHOT_FORMAT_VERSION = 1
+_TYPE_URL_PREFIX = "type.googleapis.com/"
+
+
+class ServiceSnapshot(NamedTuple):
+    """The information needed to generate a client for a measurement service."""
+
+    service_class: str
+    display_name: str
+    version: str
+    metadata: v2_measurement_service_pb2.GetMetadataResponse
+
+
+def save_snapshot(snapshot_path: pathlib.Path, services: List[ServiceSnapshot]) -> None:
+    """Saves the measurement services and their metadata to a snapshot file.
+
+    Args:
+        snapshot_path: The path of the snapshot file to write.
+        services: The measurement services to save, in enumeration order.
+    """
+    snapshot = {
+        "format_version": _SNAPSHOT_FORMAT_VERSION,
+        "services": [
+            {
+                "service_class": service.service_class,
+                "display_name": service.display_name,
+                "version": service.version,
+                "metadata": base64.b64encode(
+                    service.metadata.SerializeToString(deterministic=True)
+                ).decode("ascii"),
+            }
+            for service in services
+        ],
+    }
+    with open(snapshot_path, "w", encoding="utf-8") as file:
+        json.dump(snapshot, file, indent=2)
+        file.write("\n")
+
+    print(f"Snapshot of {len(services)} measurement services written to {snapshot_path}")
+
+
+def load_snapshot(snapshot_path: pathlib.Path) -> List[ServiceSnapshot]:
+    """Loads the measurement services and their metadata from a snapshot file.
+
+    Args:
+        snapshot_path: The path of the snapshot file to read.
+
+    Returns:
+        The measurement services, in the order in which they were saved.
+
+    Raises:
+        ValueError: If the snapshot file is not in a supported format.
+    """
+    with open(snapshot_path, "r", encoding="utf-8") as file:
+        snapshot = json.load(file)
+
+    if snapshot.get("format_version") != _SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(f"The snapshot file '{snapshot_path}' has an unsupported format.")
+
+    services: List[ServiceSnapshot] = []
+    for service in snapshot["services"]:
+        metadata = v2_measurement_service_pb2.GetMetadataResponse()
+        metadata.ParseFromString(base64.b64decode(service["metadata"]))
+        services.append(
+            ServiceSnapshot(
+                service_class=service["service_class"],
+                display_name=service["display_name"],
+                version=service["version"],
+                metadata=metadata,
+            )
+        )
+    return services
+
+
+def create_client_from_snapshot(
+    service: ServiceSnapshot,
+    directory_out: pathlib.Path,
+    class_name: str,
+    module_name: str,
+) -> None:
+    """Generates a client from the captured metadata without contacting any service.
+
+    This mirrors the client generator's own client creation, but takes the measurement
+    metadata from the snapshot instead of querying the measurement service. It uses private
+    functions of the generator, so pyproject.toml only allows the patch releases of the
+    tested generator version.
+
+    Args:
+        service: The measurement service to generate a client for.
+        directory_out: The directory where the client module is written.
+        class_name: The name of the client class.
+        module_name: The name of the client module.
+    """
+    built_in_import_modules: List[str] = []
+    custom_import_modules: List[str] = []
+    enum_values_by_type: Dict[Type[Enum], Dict[str, int]] = {}
+
+    configuration_metadata, output_metadata = get_configuration_and_output_metadata_by_index(
+        service.metadata, service.service_class, enum_values_by_type
+    )
+    configuration_parameters_with_type_and_default_values, measure_api_parameters = (
+        get_configuration_parameters_with_type_and_default_values(
+            configuration_metadata, built_in_import_modules, enum_values_by_type
+        )
+    )
+    output_parameters_with_type = get_output_parameters_with_type(
+        output_metadata, built_in_import_modules, custom_import_modules, enum_values_by_type
+    )
+
+    ni_measurement_plugin_sdk_generator.client._create_file(
+        template_name="measurement_plugin_client.py.mako",
+        file_name=f"{module_name}.py",
+        directory_out=directory_out,
+        class_name=class_name,
+        display_name=service.metadata.measurement_details.display_name,
+        version=service.version,
+        configuration_metadata=configuration_metadata,
+        output_metadata=output_metadata,
+        service_class=service.service_class,
+        configuration_parameters_with_type_and_default_values=configuration_parameters_with_type_and_default_values,
+        measure_api_parameters=measure_api_parameters,
+        output_parameters_with_type=output_parameters_with_type,
+        built_in_import_modules=to_ordered_set(built_in_import_modules),
+        custom_import_modules=to_ordered_set(custom_import_modules),
+        enum_by_class_name=enum_values_by_type,
+        configuration_parameters_type_url=_TYPE_URL_PREFIX
+        + service.metadata.measurement_signature.configuration_parameters_message_type,
+    )
+
+    print(
+        f"The measurement plug-in client for the service class '{service.service_class}' is created successfully."
+    )
@@ -0,0 +1,61 @@
+<%page args="class_names, module_names"/>\
+"""Asyncio measurement plug-in clients, created on first use.
+
+Each async client takes the same parameters as the client of the same name in the clients
+package, and measures through grpc.aio, so one event loop can run many measurements at the
+same time:
+
+    from clients import aio
+
+    outputs = await asyncio.gather(aio.first_client.measure(), aio.second_client.measure())
+"""
+
+import importlib
+import threading
+from typing import Any, Dict, List
+
+from clients import session
+from clients._aio import AsyncMeasurementClient
+
+_CLIENT_CLASS_NAMES: Dict[str, str] = {
+% for module_name, class_name in zip(module_names, class_names):
+    "${module_name}": "${class_name}",
+% endfor
+}
+
+_client_creation_lock = threading.Lock()
+
+__all__ = list(_CLIENT_CLASS_NAMES)
+
+
+class AsyncClient(AsyncMeasurementClient):
+    """The base class of the async clients.
+
+    It is defined in this public module, so that the sequence logger instruments its methods
+    like those of the clients.
+    """
+
+
+def __getattr__(name: str) -> Any:
+    """Imports the client module and creates the async client when it is first accessed."""
+    class_name = _CLIENT_CLASS_NAMES.get(name)
+    if class_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    with _client_creation_lock:
+        client = globals().get(name)
+        if client is None:
+            module = importlib.import_module(f"clients.{name}")
+            # Name the class of the async client after the client class, so that its calls
+            # are logged under the same name as those of the client.
+            async_client_class = type(class_name, (AsyncClient,), {})
+            client = session.create_async_client(
+                getattr(module, class_name), async_client_class=async_client_class
+            )
+            globals()[name] = client
+    return client
+
+
+def __dir__() -> List[str]:
+    """Lists the async clients along with the attributes that are already defined."""
+    return sorted(set(globals()) | set(_CLIENT_CLASS_NAMES))
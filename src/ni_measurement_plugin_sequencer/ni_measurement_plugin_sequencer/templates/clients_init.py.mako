@@ -0,0 +1,57 @@
+<%page args="class_names, module_names"/>\
+"""Measurement plug-in clients, imported and created on first use."""
+
+import importlib
+import sys
+import threading
+import types
+from typing import Any, Dict, List
+
+from clients._graph import SequenceRun, Step, run_steps
+from clients._sweep import SweepResult, run_sweep
+from clients._session import ClientSession
+
+_CLIENT_CLASS_NAMES: Dict[str, str] = {
+% for module_name, class_name in zip(module_names, class_names):
+    "${module_name}": "${class_name}",
+% endfor
+}
+
+_client_creation_lock = threading.Lock()
+
+# The clients share one gRPC channel pool, discovery client and pin map client.
+session = ClientSession()
+
+__all__ = list(_CLIENT_CLASS_NAMES)
+
+
+class _ClientsModule(types.ModuleType):
+    def __setattr__(self, name: str, value: Any) -> None:
+        # The import system binds each imported client module to its name in this package,
+        # which would hide the client of the same name, so the module is not bound.
+        if name in _CLIENT_CLASS_NAMES and isinstance(value, types.ModuleType):
+            return
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _ClientsModule
+
+
+def __getattr__(name: str) -> Any:
+    """Imports the client module and creates the client when it is first accessed."""
+    class_name = _CLIENT_CLASS_NAMES.get(name)
+    if class_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    with _client_creation_lock:
+        client = globals().get(name)
+        if client is None:
+            module = importlib.import_module(f"{__name__}.{name}")
+            client = session.create_client(getattr(module, class_name))
+            globals()[name] = client
+    return client
+
+
+def __dir__() -> List[str]:
+    """Lists the clients along with the attributes that are already defined."""
+    return sorted(set(globals()) | set(_CLIENT_CLASS_NAMES))
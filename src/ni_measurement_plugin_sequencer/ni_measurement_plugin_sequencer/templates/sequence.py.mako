@@ -1,19 +1,56 @@
-<%page args="instance_names, callables"/>
-from clients import ${', '.join(instance_names)}
+<%page args="instance_names, callables, step_graph=False"/>
 from ni_sequence_logger import init_log
 
-init_log()
+# Set up logging before importing the clients, so that the import hook logs each client
+# module as it is loaded.
+init_log(import_hook=True)
 
-pin_map_methods = [
+% if step_graph:
+from clients import Step, run_steps, session, ${', '.join(instance_names)}  # noqa: E402
+% else:
+from clients import session, ${', '.join(instance_names)}  # noqa: E402
+% endif
+
+measurement_clients = [
 % for instance_name in instance_names:
-    ${instance_name}.${callables[0]},
+    ${instance_name},
 % endfor
 ]
 
+# Uncomment to reuse the service resolutions of previous runs of this sequence.
+# session.enable_resolution_cache()
+
+# Connect to all the measurement plug-ins before running the sequence
+session.warm_up(measurement_clients)
+% if callables:
+
 pin_map_path = r"path\to\pinmap\file.pinmap"  # TODO: Update your pin map path here.
 
-# Register the pin map with all the measurement plug-in clients
-for register_pin_map in pin_map_methods:
-    register_pin_map(pin_map_path)
+# Register the pin map once and use it with all the measurement plug-in clients
+session.register_pin_map(pin_map_path, measurement_clients)
+% endif
+
+% if step_graph:
+# TODO: Define the steps of your sequence here. A step runs as soon as the steps it depends on
+# have completed, so the independent steps run concurrently. The parameters and the condition
+# of a step can be functions of the outputs of the completed steps, keyed by step name. For
+# example:
+#
+#     Step(
+#         "measure",
+#         measure_client,
+#         parameters=lambda outputs: {"voltage_level": outputs["source"].voltage_level},
+#         depends_on=["source"],
+#         condition=lambda outputs: outputs["source"].in_compliance,
+#     ),
+steps = [
+% for instance_name in instance_names:
+    Step("${instance_name}", ${instance_name}, parameters={}),
+% endfor
+]
 
+sequence_run = run_steps(steps)
+print(f"Critical path: {' -> '.join(sequence_run.critical_path)}")
+% else:
 # TODO: Write your sequence logic here.
+% endif
@@ -0,0 +1,91 @@
+"""Tests of the generated clients package."""
+
+import contextlib
+import io
+import pathlib
+import subprocess  # nosec: B404
+import sys
+import tempfile
+import textwrap
+import unittest
+
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1] / "benchmarks"))
+
+from _synthetic import create_service_snapshots  # noqa: E402
+
+from ni_measurement_plugin_sequencer._helpers import create_client  # noqa: E402
+from ni_measurement_plugin_sequencer._snapshot import save_snapshot  # noqa: E402
+
+
+class ClientsInitTests(unittest.TestCase):
+    """Tests the lazily loading clients/__init__.py generated from a snapshot."""
+
+    _directory: tempfile.TemporaryDirectory
+    user_directory: pathlib.Path
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Generate the clients of three synthetic measurement plug-ins."""
+        cls._directory = tempfile.TemporaryDirectory()
+        user_directory = pathlib.Path(cls._directory.name)
+        snapshot_path = user_directory / "snapshot.json"
+        with contextlib.redirect_stdout(io.StringIO()):
+            save_snapshot(snapshot_path, create_service_snapshots(3))
+            create_client(user_directory, from_snapshot=snapshot_path)
+        cls.user_directory = user_directory
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Remove the generated clients."""
+        cls._directory.cleanup()
+
+    def _run(self, code: str) -> str:
+        # Import the clients package in a new process, so that each test starts without it.
+        process = subprocess.run(  # nosec: B603
+            [sys.executable, "-c", textwrap.dedent(code)],
+            cwd=self.user_directory,
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(process.returncode, 0, process.stderr)
+        return process.stdout
+
+    def test___import_package___no_client_module_imported(self) -> None:
+        output = self._run(
+            """
+            import sys
+            import clients
+            print(sorted(name for name in clients._CLIENT_CLASS_NAMES if f"clients.{name}" in sys.modules))
+            """
+        )
+
+        self.assertEqual(output.strip(), "[]")
+
+    def test___access_client___only_its_module_imported(self) -> None:
+        output = self._run(
+            """
+            import sys
+            import clients
+            clients.synthetic_measure_1_client
+            print(sorted(name for name in clients._CLIENT_CLASS_NAMES if f"clients.{name}" in sys.modules))
+            """
+        )
+
+        self.assertEqual(output.strip(), "['synthetic_measure_1_client']")
+
+    def test___import_client_module___package_attribute_is_client(self) -> None:
+        output = self._run(
+            """
+            import clients
+            from clients.synthetic_measure_1_client import SyntheticMeasure1Client
+            import clients.synthetic_source_0_client
+            print(isinstance(clients.synthetic_measure_1_client, SyntheticMeasure1Client))
+            print(type(clients.synthetic_source_0_client).__name__)
+            """
+        )
+
+        self.assertEqual(output.split(), ["True", "SyntheticSource0Client"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+"""Measures the overhead of the logging wrapper per call of a client method.
+
+Compares an undecorated method with the same method decorated by log_instance_method,
+with logging disabled, with synchronous logging and with asynchronous logging. The log
+file is written to a temporary directory.
+
+Run from the logger package directory:
+
+    poetry run python benchmarks/bench_wrapper_overhead.py --calls 100000
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import timeit
+
+
+class _Client:
+    # The logger skips the classes defined in the main module.
+    __module__ = "clients.benchmark_client"
+
+    def measure(self, pin_names, voltage_level=6.0, current_limit=0.01):
+        return (pin_names, voltage_level, current_limit)
+
+
+def _time_per_call(client, calls: int, repeat: int) -> float:
+    timer = timeit.Timer(lambda: client.measure(["Pin1", "Pin2"], voltage_level=3.3))
+    return min(timer.repeat(repeat=repeat, number=calls)) / calls
+
+
+def main() -> None:
+    """Time the calls of an undecorated and of a decorated client method."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=100000, help="Calls per timed run.")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed runs.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # The logger creates its log file in the current directory when it is imported.
+        os.chdir(directory)
+        from ni_sequence_logger import logger
+
+        client = _Client()
+        undecorated = _time_per_call(client, args.calls, args.repeat)
+
+        setattr(_Client, "measure", logger.log_instance_method(_Client.measure))
+        root_logger = logging.getLogger()
+        root_logger.setLevel(logging.WARNING)
+        disabled = _time_per_call(client, args.calls, args.repeat)
+
+        root_logger.setLevel(logging.INFO)
+        synchronous = _time_per_call(client, args.calls, args.repeat)
+
+        logger.logger.enable_async_logging(queue_size=args.calls, overflow_policy="block")
+        asynchronous = _time_per_call(client, args.calls, args.repeat)
+        logger.logger.writer.close()
+        logging.shutdown()
+        os.chdir(os.path.dirname(directory))
+
+    for name, time_per_call in [
+        ("Undecorated", undecorated),
+        ("Logging disabled", disabled),
+        ("Synchronous logging", synchronous),
+        ("Asynchronous logging", asynchronous),
+    ]:
+        overhead = time_per_call - undecorated
+        print(f"{name:<22} {time_per_call * 1e6:8.3f} us per call ({overhead * 1e6:+8.3f} us)")
+
+
+if __name__ == "__main__":
+    main()
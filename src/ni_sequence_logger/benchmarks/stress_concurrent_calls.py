@@ -0,0 +1,159 @@
+"""Calls logged client methods from many threads and asyncio tasks, and checks the log.
+
+Every call must be logged as a complete "Method Call", "Arguments", "Return" and separator
+group, tagged with the thread or task that made the call, without records of other calls
+in between. The asyncio tasks call a method in worker threads, then await a coroutine method
+concurrently with each other. The log file is written to a temporary directory.
+
+Run from the logger package directory:
+
+    poetry run python benchmarks/stress_concurrent_calls.py --threads 16 --tasks 16 --calls 200
+"""
+
+import argparse
+import asyncio
+import collections
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple
+
+
+class Outputs(NamedTuple):
+    """Outputs of the stress client."""
+
+    site: int
+    voltage_measurements: List[float]
+
+
+class _StressClient:
+    # The logger skips the classes defined in the main module.
+    __module__ = "clients.stress_client"
+
+    def measure(self, site: int) -> Outputs:
+        # The nested call is not logged, but it must not break the nesting of the outer call.
+        self.configure(site)
+        time.sleep(random.random() * 1e-4)
+        return Outputs(site, [site * 0.5] * 4)
+
+    def configure(self, site: int) -> None:
+        time.sleep(random.random() * 1e-4)
+
+    async def measure_async(self, site: int) -> Outputs:
+        # The other tasks run while this one waits, so their calls interleave with this one.
+        await self.configure_async(site)
+        await asyncio.sleep(random.random() * 1e-4)
+        return Outputs(site, [site * 0.5] * 4)
+
+    async def configure_async(self, site: int) -> None:
+        await asyncio.sleep(random.random() * 1e-4)
+
+
+_LOGGED_CALLS = {
+    "Method Call: _StressClient.measure",
+    "Method Call: _StressClient.measure_async",
+}
+
+
+def _check_log(log_file: str, expected_calls: int) -> List[str]:
+    with open(log_file, "r", encoding="utf-8") as file:
+        lines = [line.rstrip("\n").split(",", 3) for line in file if line[:4].isdigit()]
+
+    records_by_task: Dict[str, List[str]] = collections.defaultdict(list)
+    for _, _, task, message in lines:
+        records_by_task[task].append(message)
+
+    errors = []
+    call_count = 0
+    for task, messages in records_by_task.items():
+        for index in range(0, len(messages), 4):
+            group = messages[index : index + 4]
+            if (
+                len(group) != 4
+                or group[0] not in _LOGGED_CALLS
+                or not group[1].startswith("Arguments: (site=")
+                or not group[2].startswith("Return: Outputs(site=")
+                or group[3] != "-" * 80
+            ):
+                errors.append(f"Malformed call records for '{task}': {group}")
+                break
+            call_count += 1
+    if call_count != expected_calls:
+        errors.append(f"Expected {expected_calls} logged calls, found {call_count}.")
+    return errors
+
+
+async def _run_tasks(client: _StressClient, tasks: int, calls: int) -> None:
+    async def _run_task(site: int) -> None:
+        for _ in range(calls):
+            # Each call runs in a worker thread with a copy of the task's context.
+            await asyncio.to_thread(client.measure, site)
+
+    await asyncio.gather(*(_run_task(site) for site in range(tasks)))
+
+
+async def _run_coroutines(client: _StressClient, tasks: int, calls: int) -> None:
+    async def _run_task(site: int) -> None:
+        for _ in range(calls):
+            # Each call is awaited in this task, concurrently with the calls of the other tasks.
+            await client.measure_async(site)
+
+    await asyncio.gather(*(_run_task(site) for site in range(tasks)))
+
+
+def main() -> None:
+    """Run the logged client methods concurrently and check the log."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16, help="Number of threads.")
+    parser.add_argument("--tasks", type=int, default=16, help="Number of asyncio tasks.")
+    parser.add_argument("--calls", type=int, default=200, help="Calls per thread or task.")
+    parser.add_argument(
+        "--asynchronous", action="store_true", help="Write the log from a background thread."
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # The logger creates its log file in the current directory when it is imported.
+        os.chdir(directory)
+        from ni_sequence_logger import logger
+
+        logger.apply_logging_to_class(_StressClient)
+        if args.asynchronous:
+            logger.logger.enable_async_logging(queue_size=10000, overflow_policy="block")
+
+        client = _StressClient()
+        # The asyncio tasks call measure in worker threads, then measure_async themselves.
+        expected_calls = (args.threads + 2 * args.tasks) * args.calls
+        start_barrier = threading.Barrier(args.threads)
+
+        def _run_thread(site: int) -> None:
+            start_barrier.wait()
+            for _ in range(args.calls):
+                client.measure(site)
+
+        with ThreadPoolExecutor(max_workers=args.threads) as executor:
+            list(executor.map(_run_thread, range(args.threads)))
+        asyncio.run(_run_tasks(client, args.tasks, args.calls))
+        asyncio.run(_run_coroutines(client, args.tasks, args.calls))
+
+        if logger.logger.writer is not None:
+            logger.logger.writer.close()
+        for handler in logger.logging.getLogger().handlers:
+            handler.flush()
+        errors = _check_log(logger.logger.log_file, expected_calls)
+        logger.logging.shutdown()
+        os.chdir(os.path.dirname(directory))
+
+    for error in errors[:20]:
+        print(error)
+    if errors:
+        sys.exit(1)
+    print(f"{expected_calls} concurrent calls were logged correctly.")
+
+
+if __name__ == "__main__":
+    main()
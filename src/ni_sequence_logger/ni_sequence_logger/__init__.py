@@ -1,5 +1,12 @@
 """A package for initializing and managing logging in application modules."""
 
-from .logger import init_log
+from ni_sequence_logger._result_sink import load_result_column
+from ni_sequence_logger.logger import get_latency_summary, init_log, set_result_format, set_sampling
 
-__all__ = ["init_log"]
+__all__ = [
+    "get_latency_summary",
+    "init_log",
+    "load_result_column",
+    "set_result_format",
+    "set_sampling",
+]
@@ -0,0 +1,232 @@
+"""A background writer that moves log formatting and file I/O off the calling thread."""
+
+import functools
+import logging
+import queue
+import threading
+import time
+from typing import Optional
+
+from ni_sequence_logger._rotation import LogRotator
+
+OVERFLOW_POLICIES = ("block", "drop_newest", "drop_oldest")
+
+_STOP = object()
+
+
+class AsyncLogWriter:
+    """Writes log records to a file from a background thread.
+
+    The calling thread only enqueues the record, or a single record for a group of records
+    such as those of a method call. The writer thread formats the queued records in batches,
+    appends them to the log file in the same CSV format as the synchronous logger, and
+    flushes the file once per batch.
+    """
+
+    def __init__(
+        self,
+        log_file: str,
+        queue_size: int,
+        overflow_policy: str,
+        batch_size: int = 256,
+        rotator: Optional[LogRotator] = None,
+    ):
+        """Initialize the writer and start its background thread.
+
+        Args:
+            log_file: The path of the log file to append to.
+            queue_size: The maximum number of records waiting to be written.
+            overflow_policy: What to do with a record when the queue is full: "block"
+                waits for space, "drop_newest" discards the new record and "drop_oldest"
+                discards the oldest queued record.
+            batch_size: The maximum number of records written per flush.
+            rotator: Rotates the log file before a batch that would exceed its size or
+                interval, or None to append to the same file.
+
+        Raises:
+            ValueError: If the overflow policy or the queue size is not valid.
+        """
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unsupported overflow policy {overflow_policy!r}. "
+                f"Expected one of: {', '.join(OVERFLOW_POLICIES)}."
+            )
+        if queue_size < 1:
+            raise ValueError("The queue size must be at least 1.")
+
+        self.log_file = log_file
+        self.overflow_policy = overflow_policy
+        self.batch_size = batch_size
+        self.rotator = rotator
+        self.dropped_records = 0
+        self._reported_dropped_records = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._closed = False
+        # Serializes queuing records with closing the writer.
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, name="ni_sequence_logger writer", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, level: int, task: str, indent: int, message) -> None:
+        """Queue a record to be written.
+
+        The message is converted to a string by the writer thread, so it can be an object
+        whose string conversion is expensive.
+        """
+        self._put((time.time(), level, task, indent, message))
+
+    def write_group(self, task: str, format_records, *args) -> None:
+        """Queue a group of records, such as those of a method call, as a single record.
+
+        The writer thread calls format_records(*args), which returns the creation time,
+        level, indent and message of each record of the group, and writes them together.
+        """
+        self._put((task, format_records, args))
+
+    def _put(self, record) -> None:
+        with self._lock:
+            if not self._closed:
+                self._enqueue(record)
+                return
+
+        # The writer thread is stopping, for example when logging during interpreter exit, so
+        # write the record once the writer thread has written the queued records.
+        if threading.current_thread() is not self._thread:
+            self._thread.join()
+        with self._lock:
+            with open(self.log_file, "a", encoding="utf-8") as file:
+                file.write(self._format(record))
+
+    def close(self) -> None:
+        """Write the queued records and stop the writer thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        # No record is queued after closing, so the stop marker is never dropped and is the
+        # last record written.
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _enqueue(self, record) -> None:
+        if self.overflow_policy == "block":
+            self._queue.put(record)
+            return
+
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            if self.overflow_policy == "drop_newest":
+                self.dropped_records += 1
+                return
+            while True:
+                try:
+                    self._queue.get_nowait()
+                    self.dropped_records += 1
+                except queue.Empty:
+                    pass
+                try:
+                    self._queue.put_nowait(record)
+                    return
+                except queue.Full:
+                    continue
+
+    def _run(self) -> None:
+        file = open(self.log_file, "a", encoding="utf-8")
+        try:
+            stopping = False
+            while not stopping:
+                records = []
+                record = self._queue.get()
+                while True:
+                    if record is _STOP:
+                        stopping = True
+                        break
+                    records.append(record)
+                    if len(records) >= self.batch_size:
+                        break
+                    try:
+                        record = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+
+                lines = [self._format(record) for record in records]
+                dropped_records = self.dropped_records - self._reported_dropped_records
+                if dropped_records:
+                    self._reported_dropped_records += dropped_records
+                    lines.append(
+                        self._format(
+                            (
+                                time.time(),
+                                logging.WARNING,
+                                threading.current_thread().name,
+                                0,
+                                f"{dropped_records} log records were dropped "
+                                "because the log queue was full.",
+                            )
+                        )
+                    )
+                data = "".join(lines)
+                if self.rotator is not None and self.rotator.should_rotate(file.tell(), len(data)):
+                    file.close()
+                    self.rotator.rotate()
+                    file = open(self.log_file, "a", encoding="utf-8")
+                file.write(data)
+                file.flush()
+        finally:
+            file.close()
+
+    @staticmethod
+    def _format(record) -> str:
+        if len(record) == 3:
+            task, format_records, args = record
+            try:
+                records = format_records(*args)
+            except Exception as e:
+                records = [
+                    (time.time(), logging.ERROR, 0, f"<records could not be formatted: {e!r}>")
+                ]
+            return "".join(
+                _format_line(created, level, task, indent, message)
+                for created, level, indent, message in records
+            )
+        created, level, task, indent, message = record
+        return _format_line(created, level, task, indent, message)
+
+
+def _format_line(created: float, level: int, task: str, indent: int, message) -> str:
+    try:
+        text = str(message)
+    except Exception as e:
+        text = f"<message could not be formatted: {e!r}>"
+    text = text.replace(",", ";")
+    asctime = _format_time(int(created))
+    return f"{asctime},{logging.getLevelName(level)},{task},{'  ' * indent}{text}\n"
+
+
+@functools.lru_cache(maxsize=1)
+def _format_time(seconds: int) -> str:
+    # The records of a batch are mostly created in the same second.
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(seconds))
+
+
+class AsyncLogHandler(logging.Handler):
+    """Queues the records of the other loggers to an AsyncLogWriter.
+
+    The log file then has a single writer, so it can be rotated while records are written.
+    """
+
+    def __init__(self, writer: AsyncLogWriter):
+        """Initialize the handler."""
+        super().__init__()
+        self.writer = writer
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Queue the record, tagged with the thread or task that logged it."""
+        try:
+            task = getattr(record, "task", None) or (record.threadName or "").replace(",", ";")
+            self.writer.write(record.levelno, task, 0, record.getMessage())
+        except Exception:
+            self.handleError(record)
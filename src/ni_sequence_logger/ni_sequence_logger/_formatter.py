@@ -0,0 +1,106 @@
+"""Formats logged values with bounded length, summarizing long numeric sequences."""
+
+import collections.abc
+import itertools
+import math
+from typing import Any, NamedTuple
+
+
+class ResultFormat(NamedTuple):
+    """How the logged return values of a client class are formatted.
+
+    Sequences with more than max_elements elements are shortened: numeric sequences are
+    summarized with their count, minimum, maximum and mean, and other sequences show their
+    first max_elements elements. Strings longer than max_string_length characters are
+    truncated. When full is True, the complete repr of the value is logged instead.
+    """
+
+    max_elements: int = 10
+    max_string_length: int = 200
+    full: bool = False
+
+
+DEFAULT_RESULT_FORMAT = ResultFormat()
+
+
+def format_result(value: Any, result_format: ResultFormat = DEFAULT_RESULT_FORMAT) -> str:
+    """Format a value like repr, but bounded by the given result format.
+
+    Values that fit in the result format are formatted exactly like repr.
+    """
+    if result_format.full:
+        return repr(value)
+    return _format(value, result_format)
+
+
+def _format(value: Any, result_format: ResultFormat) -> str:
+    if value is None or isinstance(value, (bool, int, float, complex)):
+        return repr(value)
+    if isinstance(value, (str, bytes)):
+        return _truncate(repr(value), result_format.max_string_length)
+    if isinstance(value, tuple) and hasattr(value, "_fields"):
+        fields = ", ".join(
+            f"{name}={_format(field, result_format)}" for name, field in zip(value._fields, value)
+        )
+        return f"{type(value).__name__}({fields})"
+    if isinstance(value, collections.abc.Sequence):
+        return _format_sequence(value, result_format)
+    if isinstance(value, collections.abc.Mapping):
+        items = [
+            f"{_format(key, result_format)}: {_format(item, result_format)}"
+            for key, item in itertools.islice(value.items(), result_format.max_elements)
+        ]
+        if len(value) > result_format.max_elements:
+            items.append(f"... {len(value) - result_format.max_elements} more")
+        return "{" + ", ".join(items) + "}"
+    if hasattr(value, "dtype") and hasattr(value, "shape"):
+        return _format_array(value, result_format)
+    return _truncate(repr(value), result_format.max_string_length)
+
+
+def _format_sequence(value: Any, result_format: ResultFormat) -> str:
+    if len(value) > result_format.max_elements:
+        if all(_is_number(element) for element in value):
+            return _summarize(len(value), min(value), max(value), math.fsum(value) / len(value))
+        elements = [
+            _format(element, result_format)
+            for element in itertools.islice(value, result_format.max_elements)
+        ]
+        elements.append(f"... {len(value) - result_format.max_elements} more")
+    else:
+        elements = [_format(element, result_format) for element in value]
+
+    if isinstance(value, tuple):
+        return "(" + ", ".join(elements) + ("," if len(elements) == 1 else "") + ")"
+    return "[" + ", ".join(elements) + "]"
+
+
+def _format_array(value: Any, result_format: ResultFormat) -> str:
+    # NumPy arrays and array-like values are summarized without importing NumPy.
+    if value.size <= result_format.max_elements:
+        return _truncate(repr(value), result_format.max_string_length)
+    if value.dtype.kind in "iuf":
+        return _summarize(value.size, value.min(), value.max(), value.mean())
+    return f"<{value.size} values of type {value.dtype} with shape {tuple(value.shape)}>"
+
+
+def _summarize(count: int, minimum: Any, maximum: Any, mean: Any) -> str:
+    return (
+        f"<{count} values: min={_to_python(minimum)!r} max={_to_python(maximum)!r} "
+        f"mean={float(mean)!r}>"
+    )
+
+
+def _to_python(value: Any) -> Any:
+    # Convert NumPy scalars, so that they are formatted like Python numbers.
+    return value.item() if hasattr(value, "item") else value
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _truncate(text: str, max_length: int) -> str:
+    if len(text) <= max_length:
+        return text
+    return f"{text[:max_length]}... ({len(text) - max_length} more characters)"
@@ -0,0 +1,77 @@
+"""An import hook that applies logging to the client modules as they are imported."""
+
+import importlib.abc
+import sys
+import threading
+from types import ModuleType
+from typing import Callable, Optional, Sequence
+
+
+class _LoggingLoader(importlib.abc.Loader):
+    """Executes a module with its original loader, then applies logging to it."""
+
+    def __init__(self, loader: importlib.abc.Loader, on_import: Callable[[ModuleType], None]):
+        self._loader = loader
+        self._on_import = on_import
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        self._loader.exec_module(module)
+        self._on_import(module)
+
+    def __getattr__(self, name: str):
+        # Forward the optional loader methods, such as get_source or is_package.
+        return getattr(self._loader, name)
+
+
+class ClientImportHook(importlib.abc.MetaPathFinder):
+    """Finds the modules of a package with the other finders and wraps their loader.
+
+    The private modules of the package, whose name starts with an underscore, are imported
+    unchanged.
+    """
+
+    def __init__(self, package: str, on_import: Callable[[ModuleType], None]):
+        """Initialize the hook.
+
+        Args:
+            package: The name of the package whose modules are instrumented, such as "clients".
+            on_import: Called with each module of the package after it is executed.
+        """
+        self._prefix = package + "."
+        self._on_import = on_import
+        self._finding = threading.local()
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Optional[Sequence[str]],
+        target: Optional[ModuleType] = None,
+    ):
+        """Find the module with the other finders, and wrap its loader if it is instrumented."""
+        if (
+            not fullname.startswith(self._prefix)
+            or fullname[len(self._prefix)].startswith("_")
+            or getattr(self._finding, "active", False)
+        ):
+            return None
+
+        # Let the other finders locate the module, without finding it again with this hook.
+        self._finding.active = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._finding.active = False
+
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _LoggingLoader(spec.loader, self._on_import)
+        return spec
@@ -0,0 +1,152 @@
+"""Streaming latency histograms of the logged method calls."""
+
+import math
+import threading
+from typing import Dict, NamedTuple
+
+# Each power of two is divided into this many buckets, so a percentile is estimated within
+# about 2% of the measured latency.
+_BUCKETS_PER_OCTAVE = 16
+
+
+class LatencySummary(NamedTuple):
+    """The latency statistics of a method, in seconds."""
+
+    call_count: int
+    mean: float
+    p50: float
+    p95: float
+    p99: float
+    max: float
+
+
+class LatencyHistogram:
+    """Counts latencies in logarithmic buckets, using memory independent of the call count."""
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self._lock = threading.Lock()
+        self._buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def record(self, latency_ns: int) -> None:
+        """Add a latency, in nanoseconds."""
+        bucket = int(math.log2(latency_ns) * _BUCKETS_PER_OCTAVE) if latency_ns > 0 else -1
+        with self._lock:
+            self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+            if self.count == 0 or latency_ns < self.min:
+                self.min = latency_ns
+            if latency_ns > self.max:
+                self.max = latency_ns
+            self.count += 1
+            self.total += latency_ns
+
+    def percentile(self, percent: float) -> float:
+        """Estimate the given percentile of the latencies, in nanoseconds."""
+        with self._lock:
+            if self.count == 0:
+                return 0.0
+            rank = math.ceil(self.count * percent / 100)
+            seen = 0
+            for bucket in sorted(self._buckets):
+                seen += self._buckets[bucket]
+                if seen >= rank:
+                    break
+            if bucket < 0:
+                return 0.0
+            # Use the geometric middle of the bucket, within the measured range.
+            estimate = 2 ** ((bucket + 0.5) / _BUCKETS_PER_OCTAVE)
+            return min(max(estimate, self.min), self.max)
+
+    def summarize(self) -> LatencySummary:
+        """Get the statistics of the latencies, in seconds."""
+        with self._lock:
+            count, total, maximum = self.count, self.total, self.max
+        return LatencySummary(
+            call_count=count,
+            mean=total / count / 1e9 if count else 0.0,
+            p50=self.percentile(50) / 1e9,
+            p95=self.percentile(95) / 1e9,
+            p99=self.percentile(99) / 1e9,
+            max=maximum / 1e9,
+        )
+
+
+class LatencyRecorder:
+    """Keeps a latency histogram for each logged method."""
+
+    def __init__(self) -> None:
+        """Initialize the recorder without any histogram."""
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+
+    def record(self, call_signature: str, latency_ns: int) -> None:
+        """Add the latency of a call of the given method, in nanoseconds."""
+        histogram = self._histograms.get(call_signature)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(call_signature, LatencyHistogram())
+        histogram.record(latency_ns)
+
+    def summarize(self) -> Dict[str, LatencySummary]:
+        """Get the latency statistics of each method, sorted by total time, longest first."""
+        with self._lock:
+            histograms = list(self._histograms.items())
+        histograms.sort(key=lambda item: item[1].total, reverse=True)
+        return {call_signature: histogram.summarize() for call_signature, histogram in histograms}
+
+    def clear(self) -> None:
+        """Remove the latencies of all methods."""
+        with self._lock:
+            self._histograms.clear()
+
+
+class StreamStatistics:
+    """The timing of the responses of a stream, measured as they are received."""
+
+    def __init__(self, start_time_ns: int) -> None:
+        """Initialize the statistics of a stream that started at the given time."""
+        self.start_time_ns = start_time_ns
+        self.end_time_ns = start_time_ns
+        self.last_response_time_ns = start_time_ns
+        self.first_response_ns = 0
+        self.response_count = 0
+        self.max_inter_arrival_ns = 0
+        self.closed = False
+
+    def add_response(self, time_ns: int) -> int:
+        """Add a response received at the given time, and return its latency in nanoseconds.
+
+        The latency of the first response is the time since the start of the stream, and the
+        latency of the other responses is the time since the previous response.
+        """
+        latency_ns = time_ns - self.last_response_time_ns
+        if self.response_count == 0:
+            self.first_response_ns = latency_ns
+        elif latency_ns > self.max_inter_arrival_ns:
+            self.max_inter_arrival_ns = latency_ns
+        self.response_count += 1
+        self.last_response_time_ns = time_ns
+        return latency_ns
+
+    def __str__(self) -> str:
+        """Describe the stream in a log message."""
+        total_ns = self.end_time_ns - self.start_time_ns
+        plural = "" if self.response_count == 1 else "s"
+        text = f"Stream: {self.response_count} response{plural} in {total_ns / 1e6:.3f} ms"
+        if self.response_count:
+            text += f"; first response after {self.first_response_ns / 1e6:.3f} ms"
+        if self.response_count > 1:
+            mean_ns = (self.last_response_time_ns - self.start_time_ns - self.first_response_ns) / (
+                self.response_count - 1
+            )
+            text += (
+                f"; inter-arrival mean {mean_ns / 1e6:.3f} ms"
+                f" and max {self.max_inter_arrival_ns / 1e6:.3f} ms"
+            )
+        if self.closed:
+            text += "; closed before the end of the stream"
+        return text
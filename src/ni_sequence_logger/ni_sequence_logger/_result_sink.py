@@ -0,0 +1,275 @@
+"""Saves the outputs of the logged methods as binary columns that can be memory mapped."""
+
+import array
+import enum
+import json
+import logging
+import os
+import sys
+import threading
+import typing
+from typing import Any, Dict, List, Optional, Tuple
+
+_RESULTS_FORMAT_VERSION = 1
+_SCHEMA_FILE_NAME = "schema.json"
+
+# The array type code and NumPy dtype of each column type.
+_TYPE_CODES = {"float64": "d", "int64": "q", "bool": "B", "string": "q"}
+_DTYPES = {"float64": "f8", "int64": "i8", "bool": "u1", "string": "i8"}
+
+_logger = logging.getLogger(__name__)
+
+
+def _get_column_type(annotation: Any) -> Tuple[Optional[str], bool]:
+    """Get the column type of a field annotation and whether the field is repeated."""
+    origin = typing.get_origin(annotation)
+    if origin in (list, tuple) or (
+        origin is not None and getattr(origin, "__name__", "") in ("Sequence", "Iterable")
+    ):
+        element_types = typing.get_args(annotation)
+        if not element_types:
+            return None, True
+        element_type, repeated = _get_column_type(element_types[0])
+        return (element_type, True) if not repeated else (None, True)
+    if annotation is bool:
+        return "bool", False
+    if annotation is int or (isinstance(annotation, type) and issubclass(annotation, enum.Enum)):
+        return "int64", False
+    if annotation is float:
+        return "float64", False
+    if annotation is str:
+        return "string", False
+    return None, False
+
+
+def _convert(column_type: str, value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        value = value.value
+    if column_type == "float64":
+        return float(value)
+    if column_type == "int64":
+        return int(value)
+    return bool(value)
+
+
+class _Column:
+    """An append-only column of values, with per-call offsets if the field is repeated."""
+
+    def __init__(self, directory: str, name: str, column_type: str, repeated: bool):
+        self.column_type = column_type
+        self.repeated = repeated
+        self._type_code = _TYPE_CODES[column_type]
+        self._values_file = open(os.path.join(directory, f"{name}.values"), "ab")
+        self._offsets_file = (
+            open(os.path.join(directory, f"{name}.offsets"), "ab") if repeated else None
+        )
+        self._strings_file = (
+            open(os.path.join(directory, f"{name}.utf8"), "ab") if column_type == "string" else None
+        )
+        self._value_count = 0
+        self._string_size = 0
+
+    def encode(self, value: Any) -> Any:
+        """Convert the value of a call to the values to write, without writing them."""
+        values = list(value) if self.repeated else [value]
+        if self.column_type == "string":
+            return [str(element).encode("utf-8") for element in values]
+        return array.array(
+            self._type_code, [_convert(self.column_type, element) for element in values]
+        )
+
+    def write(self, encoded_values: Any) -> None:
+        """Append the encoded values of a call to the column."""
+        if self._strings_file is not None:
+            # Strings are stored as UTF-8 data, and the values are their end offsets.
+            offsets = array.array("q")
+            for data in encoded_values:
+                self._strings_file.write(data)
+                self._string_size += len(data)
+                offsets.append(self._string_size)
+            offsets.tofile(self._values_file)
+        else:
+            encoded_values.tofile(self._values_file)
+
+        self._value_count += len(encoded_values)
+        if self._offsets_file is not None:
+            array.array("q", [self._value_count]).tofile(self._offsets_file)
+
+    def flush(self) -> None:
+        for file in (self._values_file, self._offsets_file, self._strings_file):
+            if file is not None:
+                file.flush()
+
+    def close(self) -> None:
+        for file in (self._values_file, self._offsets_file, self._strings_file):
+            if file is not None:
+                file.close()
+
+
+class _Table:
+    """The columns of the outputs returned by one method, one row per call."""
+
+    def __init__(self, directory: str, outputs_type: type):
+        os.makedirs(directory, exist_ok=True)
+        self.outputs_type = outputs_type
+        self.columns: Dict[str, _Column] = {}
+        self._time_column = _Column(directory, "_time", "float64", repeated=False)
+
+        try:
+            annotations = typing.get_type_hints(outputs_type)
+        except Exception:
+            annotations = getattr(outputs_type, "__annotations__", {})
+        schema: Dict[str, Any] = {
+            "_time": {"type": "float64", "repeated": False},
+        }
+        for field in outputs_type._fields:  # type: ignore[attr-defined]
+            column_type, repeated = _get_column_type(annotations.get(field))
+            if column_type is None:
+                schema[field] = {"type": None, "repeated": repeated}
+                continue
+            self.columns[field] = _Column(directory, field, column_type, repeated)
+            schema[field] = {"type": column_type, "repeated": repeated}
+
+        with open(os.path.join(directory, _SCHEMA_FILE_NAME), "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "format_version": _RESULTS_FORMAT_VERSION,
+                    "byte_order": sys.byteorder,
+                    "outputs_type": outputs_type.__name__,
+                    "columns": schema,
+                },
+                file,
+                indent=2,
+            )
+
+    def append(self, created: float, outputs: Any) -> None:
+        # Encode every field before writing, so that a value that cannot be converted does
+        # not leave the columns with different numbers of rows.
+        encoded_values = [
+            (column, column.encode(getattr(outputs, field)))
+            for field, column in self.columns.items()
+        ]
+        self._time_column.write(self._time_column.encode(created))
+        for column, values in encoded_values:
+            column.write(values)
+
+    def flush(self) -> None:
+        self._time_column.flush()
+        for column in self.columns.values():
+            column.flush()
+
+    def close(self) -> None:
+        self._time_column.close()
+        for column in self.columns.values():
+            column.close()
+
+
+class ResultSink:
+    """Appends the outputs returned by each method to typed binary columns.
+
+    The outputs of each method are saved in their own directory of the run directory,
+    with one file per field. Fields of type float, int, bool and str, enums and lists of
+    these are saved; the other fields are listed in the schema without values. A row is
+    added for each call, along with the time of the call.
+    """
+
+    def __init__(self, run_directory: str):
+        """Initialize the result sink.
+
+        Args:
+            run_directory: The directory where the results of the run are saved.
+        """
+        self.run_directory = run_directory
+        self._lock = threading.Lock()
+        self._tables: Dict[str, _Table] = {}
+        self._failed_tables: set = set()
+
+    def append(self, call_signature: str, created: float, outputs: Any) -> None:
+        """Save the outputs returned by a call of the given method."""
+        with self._lock:
+            table = self._tables.get(call_signature)
+            if table is None or table.outputs_type is not type(outputs):
+                if table is not None:
+                    # The method returned another type, so save it in a separate table.
+                    call_signature = f"{call_signature}.{type(outputs).__name__}"
+                    table = self._tables.get(call_signature)
+                if table is None:
+                    table = _Table(os.path.join(self.run_directory, call_signature), type(outputs))
+                    self._tables[call_signature] = table
+            try:
+                table.append(created, outputs)
+            except (OverflowError, TypeError, ValueError) as e:
+                if call_signature not in self._failed_tables:
+                    self._failed_tables.add(call_signature)
+                    _logger.warning("Could not save the outputs of %s: %s", call_signature, e)
+
+    def flush(self) -> None:
+        """Write the buffered values to the column files."""
+        with self._lock:
+            for table in self._tables.values():
+                table.flush()
+
+    def close(self) -> None:
+        """Write the buffered values and close the column files."""
+        with self._lock:
+            for table in self._tables.values():
+                table.close()
+            self._tables.clear()
+
+
+def load_result_column(
+    run_directory: str, call_signature: str, field: str, with_offsets: bool = False
+):
+    """Load a column of saved outputs as a NumPy array.
+
+    Numeric and bool columns are memory mapped, so loading them does not read the file.
+
+    Args:
+        run_directory: The directory where the results of the run were saved.
+        call_signature: The logged method, such as "NIDCPowerSourceDCVoltageClient.measure".
+        field: The name of the output field, or "_time" for the times of the calls.
+        with_offsets: Whether to also return the end offset of the values of each call, for
+            a repeated field. The values of call i are values[offsets[i - 1]:offsets[i]].
+
+    Returns:
+        The values of the column, or a tuple of the values and the offsets if with_offsets
+        is True. Strings are returned as an array of objects.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+        KeyError: If the column was not saved.
+    """
+    import numpy
+
+    directory = os.path.join(run_directory, call_signature)
+    with open(os.path.join(directory, _SCHEMA_FILE_NAME), "r", encoding="utf-8") as file:
+        schema = json.load(file)
+    column = schema["columns"][field]
+    if column["type"] is None:
+        raise KeyError(f"The values of the field {field!r} were not saved.")
+
+    byte_order = "<" if schema["byte_order"] == "little" else ">"
+    values = _memmap(numpy, os.path.join(directory, f"{field}.values"), byte_order, column["type"])
+    if column["type"] == "bool":
+        values = values.view(numpy.bool_)
+    elif column["type"] == "string":
+        with open(os.path.join(directory, f"{field}.utf8"), "rb") as file:
+            data = file.read()
+        starts: List[int] = [0] + values[:-1].tolist()
+        values = numpy.array(
+            [data[start:end].decode("utf-8") for start, end in zip(starts, values.tolist())],
+            dtype=object,
+        )
+
+    if not with_offsets:
+        return values
+    offsets = _memmap(numpy, os.path.join(directory, f"{field}.offsets"), byte_order, "int64")
+    return values, offsets
+
+
+def _memmap(numpy: Any, path: str, byte_order: str, column_type: str):
+    dtype = numpy.dtype(byte_order + _DTYPES[column_type])
+    if os.path.getsize(path) == 0:
+        # An empty file cannot be memory mapped.
+        return numpy.empty(0, dtype=dtype)
+    return numpy.memmap(path, dtype=dtype, mode="r")
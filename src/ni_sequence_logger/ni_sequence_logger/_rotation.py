@@ -0,0 +1,146 @@
+"""Rotation of the log file into compressed segments, with a cap on the retained segments."""
+
+import glob
+import gzip
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+_SEGMENT_PREFIX = "log_"
+_SEGMENT_PATTERN = "log_*_*_*.csv*"
+
+_STOP = object()
+
+_logger = logging.getLogger(__name__)
+
+
+class LogRotator:
+    """Decides when the log file is rotated, and compresses and removes the rotated segments.
+
+    A rotated segment is renamed with the time of the rotation, so its name is unique and the
+    segments sort by age. The segments are compressed with gzip on a background thread, and
+    only the newest segments are kept.
+    """
+
+    def __init__(
+        self,
+        log_file: str,
+        max_bytes: Optional[int],
+        interval: Optional[float],
+        backup_count: int,
+        compress: bool = True,
+    ):
+        """Initialize the rotator and start its compression thread.
+
+        Args:
+            log_file: The path of the log file.
+            max_bytes: The size at which the log file is rotated, or None.
+            interval: The number of seconds after which the log file is rotated, or None.
+            backup_count: The maximum number of rotated segments kept in the log directory.
+            compress: Whether to compress the rotated segments.
+
+        Raises:
+            ValueError: If the size, interval or backup count is not valid.
+        """
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("The maximum log size must be at least 1 byte.")
+        if interval is not None and interval <= 0:
+            raise ValueError("The rotation interval must be greater than 0.")
+        if backup_count < 0:
+            raise ValueError("The number of retained logs must not be negative.")
+
+        self.log_file = log_file
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.backup_count = backup_count
+        self.compress = compress
+        self._rotation_time = time.monotonic() + interval if interval is not None else None
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run, name="ni_sequence_logger compressor", daemon=True
+        )
+        self._thread.start()
+
+    def should_rotate(self, size: int, pending_size: int) -> bool:
+        """Get whether the log file must be rotated before more data is written to it.
+
+        Args:
+            size: The current size of the log file.
+            pending_size: The size of the data about to be written.
+        """
+        if size == 0:
+            return False
+        if self.max_bytes is not None and size + pending_size > self.max_bytes:
+            return True
+        return self._rotation_time is not None and time.monotonic() >= self._rotation_time
+
+    def rotate(self) -> None:
+        """Rename the closed log file to a new segment, and queue it for compression."""
+        if self.interval is not None:
+            self._rotation_time = time.monotonic() + self.interval
+        if not os.path.exists(self.log_file):
+            return
+
+        directory = os.path.dirname(self.log_file)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        segment = os.path.join(directory, f"{_SEGMENT_PREFIX}{timestamp}.csv")
+        index = 1
+        while os.path.exists(segment) or os.path.exists(segment + ".gz"):
+            segment = os.path.join(directory, f"{_SEGMENT_PREFIX}{timestamp}_{index}.csv")
+            index += 1
+        os.replace(self.log_file, segment)
+        self._queue.put(segment)
+
+    def close(self) -> None:
+        """Wait until the rotated segments are compressed, and stop the compression thread."""
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            segment = self._queue.get()
+            if segment is _STOP:
+                return
+            try:
+                if self.compress:
+                    with open(segment, "rb") as source, gzip.open(segment + ".gz", "wb") as target:
+                        shutil.copyfileobj(source, target)
+                    os.remove(segment)
+                self._remove_old_segments(os.path.dirname(segment))
+            except OSError as e:
+                _logger.warning("Could not compress or remove the log segment %s: %s", segment, e)
+
+    def _remove_old_segments(self, directory: str) -> None:
+        segments = sorted(glob.glob(os.path.join(directory, _SEGMENT_PATTERN)))
+        for segment in segments[: max(len(segments) - self.backup_count, 0)]:
+            os.remove(segment)
+
+
+class RotatingLogHandler(logging.handlers.BaseRotatingHandler):
+    """A log file handler that rotates its file with a LogRotator."""
+
+    def __init__(self, rotator: LogRotator):
+        """Initialize the handler, appending to the log file of the rotator."""
+        super().__init__(rotator.log_file, "a", encoding="utf-8")
+        self.log_rotator = rotator
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:  # noqa: N802 - overrides
+        """Get whether the log file must be rotated before the record is written."""
+        if self.stream is None:
+            self.stream = self._open()
+        pending_size = len(self.format(record)) + len(self.terminator)
+        return self.log_rotator.should_rotate(self.stream.tell(), pending_size)
+
+    def doRollover(self) -> None:  # noqa: N802 - overrides
+        """Close the log file, rotate it and open a new log file."""
+        if self.stream is not None:
+            self.stream.close()
+        self.stream = None  # type: ignore[assignment]
+        self.log_rotator.rotate()
+        self.stream = self._open()
@@ -0,0 +1,85 @@
+"""Sampling policies that limit which calls of a method are logged."""
+
+import threading
+import time
+from typing import Any, NamedTuple, Optional
+
+_NO_RESULT = object()
+
+
+class SamplingPolicy(NamedTuple):
+    """Which calls of a method are logged.
+
+    A call is logged if it is one of every calls and the rate limit allows it, if it raises
+    an exception and on_exception is True, or if its return value differs from the return
+    value of the previous call and on_change is True.
+    """
+
+    every: Optional[int] = 1
+    max_per_second: Optional[float] = None
+    on_exception: bool = False
+    on_change: bool = False
+
+
+class Sampler:
+    """Decides which calls of a method are logged and counts the suppressed calls."""
+
+    def __init__(self, policy: SamplingPolicy) -> None:
+        """Initialize the sampler of a method.
+
+        Raises:
+            ValueError: If the policy is not valid.
+        """
+        if policy.every is not None and policy.every < 1:
+            raise ValueError("The sampling interval must be at least 1.")
+        if policy.max_per_second is not None and policy.max_per_second <= 0:
+            raise ValueError("The maximum rate must be greater than 0.")
+        self.policy = policy
+        self.call_count = 0
+        self.logged_count = 0
+        self.suppressed_count = 0
+        self._lock = threading.Lock()
+        self._unreported_count = 0
+        self._next_time = 0.0
+        self._previous_result: Any = _NO_RESULT
+
+    def sample(self) -> bool:
+        """Count a call and decide whether it is logged before it is made."""
+        with self._lock:
+            self.call_count += 1
+            every = self.policy.every
+            if every is None or (self.call_count - 1) % every:
+                return False
+            if self.policy.max_per_second is not None:
+                now = time.monotonic()
+                if now < self._next_time:
+                    return False
+                self._next_time = now + 1 / self.policy.max_per_second
+            return True
+
+    def is_changed(self, result: Any) -> bool:
+        """Remember the return value of a call and get whether it differs from the previous."""
+        if not self.policy.on_change:
+            return False
+        with self._lock:
+            previous, self._previous_result = self._previous_result, result
+        if previous is _NO_RESULT:
+            return True
+        try:
+            return bool(result != previous)
+        except (TypeError, ValueError):
+            # Values such as NumPy arrays cannot be compared with a single boolean.
+            return repr(result) != repr(previous)
+
+    def suppress(self) -> None:
+        """Count a call that is not logged."""
+        with self._lock:
+            self.suppressed_count += 1
+            self._unreported_count += 1
+
+    def take_unreported_count(self) -> int:
+        """Count a logged call, and get the number of calls suppressed since the previous one."""
+        with self._lock:
+            self.logged_count += 1
+            count, self._unreported_count = self._unreported_count, 0
+        return count
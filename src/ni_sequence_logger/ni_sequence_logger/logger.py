@@ -1,12 +1,127 @@
 """A logging framework for tracking method calls, returns, and exceptions in classes."""
 
+import asyncio
+import atexit
+import contextvars
 import functools
 import inspect
 import logging
 import os
 import sys
+import threading
+import time
 import traceback
 from datetime import datetime
+from typing import Optional
+
+from ni_sequence_logger._async_writer import AsyncLogHandler, AsyncLogWriter
+from ni_sequence_logger._formatter import (
+    DEFAULT_RESULT_FORMAT,
+    format_result,
+    ResultFormat,
+)
+from ni_sequence_logger._import_hook import ClientImportHook
+from ni_sequence_logger._latency import LatencyRecorder, StreamStatistics
+from ni_sequence_logger._result_sink import ResultSink
+from ni_sequence_logger._rotation import LogRotator, RotatingLogHandler
+from ni_sequence_logger._sampling import Sampler, SamplingPolicy
+
+
+class _LazyMessage:
+    """A log message that is only formatted when it is written."""
+
+    __slots__ = ("function", "args")
+
+    def __init__(self, function, *args):
+        self.function = function
+        self.args = args
+
+    def __str__(self) -> str:
+        return self.function(*self.args)
+
+
+def _format_arguments(param_names: list, args: tuple, kwargs: dict) -> str:
+    # Skip 'self' in param names and args
+    args_repr = [f"{name}={repr(arg)}" for name, arg in zip(list(param_names)[1:], args[1:])]
+    kwargs_repr = [f"{k}={v!r}" for k, v in kwargs.items()]
+    return f"Arguments: ({', '.join(args_repr + kwargs_repr)})"
+
+
+def _format_return(result, result_format: ResultFormat) -> str:
+    return f"Return: {format_result(result, result_format)}"
+
+
+def _get_result_format(call_signature: str) -> ResultFormat:
+    return logger.result_formats.get(call_signature.split(".", 1)[0], DEFAULT_RESULT_FORMAT)
+
+
+def _format_call(
+    call_signature: str,
+    args: tuple,
+    kwargs: dict,
+    param_names: tuple,
+    end_time: float,
+    duration_ns: int,
+    result,
+    exc_info: Optional[tuple],
+) -> list:
+    """Get the records of a method call that ended, in the format of AsyncLogWriter.write_group."""
+    start_time = end_time - duration_ns / 1e9
+    records = [
+        (start_time, logging.INFO, 0, f"Method Call: {call_signature}"),
+        (start_time, logging.INFO, 0, _LazyMessage(_format_arguments, param_names, args, kwargs)),
+    ]
+    if exc_info is None:
+        result_format = _get_result_format(call_signature)
+        records.append(
+            (end_time, logging.INFO, 0, _LazyMessage(_format_return, result, result_format))
+        )
+        records.append((end_time, logging.INFO, 0, "-" * 80))
+    else:
+        traceback_text = "".join(traceback.format_exception(*exc_info))
+        records.append(
+            (end_time, logging.ERROR, 0, f"Exception in {call_signature}: {exc_info[1]}")
+        )
+        records.append((end_time, logging.ERROR, 0, traceback_text))
+        records.append((end_time, logging.INFO, 0, "-" * 40))
+    return records
+
+
+# The number of logged method calls in progress in the current thread or asyncio task. A
+# context variable is copied into each asyncio task, so the calls awaited concurrently by
+# different tasks are counted separately. Only the outermost calls, made at depth 0, are
+# logged.
+_call_depth: contextvars.ContextVar = contextvars.ContextVar(
+    "ni_sequence_logger_call_depth", default=0
+)
+
+
+def _get_task_name() -> str:
+    """Get the name of the current thread, followed by the name of the asyncio task if any."""
+    name = threading.current_thread().name
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    if task is not None:
+        name = f"{name}/{task.get_name()}"
+    return name.replace(",", ";")
+
+
+_LOG_FORMAT = "%(asctime)s,%(levelname)s,%(task)s,%(message)s"
+_LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class _TaskFilter(logging.Filter):
+    """Tags the records of the other loggers with the thread or task that logged them.
+
+    The log file then has the same columns for every record.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "task"):
+            record.task = _get_task_name()
+        return True
 
 
 class _Logger:
@@ -15,115 +130,537 @@ class _Logger:
     def __init__(self):
         """Initialize the Logger instance and set up logging."""
         self.setup_logging()
-        self.indent = 0
-        self.logged_functions = set()
-        self.call_stack = []
+        self.writer = None
+        self.rotator = None
+        self.result_formats = {}
+        self.result_sink = None
+        self.latencies = LatencyRecorder()
+        self.latency_summary_enabled = False
+        self.samplers = {}
+        self.sampling_summary_enabled = False
 
     def setup_logging(self):
         """Set up logging configuration, including log file creation."""
         log_dir = os.path.join(os.getcwd(), "logs")
+        self.log_dir = log_dir
 
         if not os.path.exists(log_dir):
             os.makedirs(log_dir)
 
         date_str = datetime.now().strftime("%Y%m%d")
-        log_file = os.path.join(log_dir, f"log_{date_str}.csv")
+        self.log_file = os.path.join(log_dir, f"log_{date_str}.csv")
 
         logging.basicConfig(
-            filename=log_file,
+            filename=self.log_file,
             level=logging.INFO,
-            format="%(asctime)s,%(levelname)s,%(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
+            format=_LOG_FORMAT,
+            datefmt=_LOG_DATE_FORMAT,
         )
+        for handler in logging.getLogger().handlers:
+            if isinstance(handler, logging.FileHandler) and handler.baseFilename == (
+                os.path.abspath(self.log_file)
+            ):
+                handler.addFilter(_TaskFilter())
+
+    def enable_async_logging(self, queue_size: int, overflow_policy: str):
+        """Write the log messages from a background thread instead of the calling thread."""
+        if self.writer is None:
+            self.writer = AsyncLogWriter(
+                self.log_file, queue_size, overflow_policy, rotator=self.rotator
+            )
+            atexit.register(self.writer.close)
+            self._replace_file_handler(AsyncLogHandler(self.writer))
 
-    def log(self, level: int, message: str):
-        """Log a message with the given log level and indentation."""
-        indent = "  " * self.indent
-        message = message.replace(",", ";")
-        logging.log(level, f"{indent}{message}")
+    def enable_rotation(
+        self,
+        max_bytes: Optional[int],
+        interval: Optional[float],
+        backup_count: int,
+        compress: bool,
+    ):
+        """Rotate the log file into compressed segments when it is too large or too old."""
+        if self.rotator is None:
+            self.rotator = LogRotator(self.log_file, max_bytes, interval, backup_count, compress)
+            atexit.register(self.rotator.close)
+            if self.writer is not None:
+                self.writer.rotator = self.rotator
+            else:
+                self._replace_file_handler(RotatingLogHandler(self.rotator))
 
-    def log_call(
-        self, instance, method_name: str, args: tuple, kwargs: dict, context: str, param_names: list
+    def _replace_file_handler(self, handler: logging.Handler):
+        """Replace the handler that writes to the log file, keeping its formatter and filters.
+
+        If the root logger was configured before the logger, so that it does not write to
+        the log file, the handler is added to the root logger instead.
+        """
+        root = logging.getLogger()
+        for file_handler in root.handlers:
+            if isinstance(file_handler, logging.FileHandler) and file_handler.baseFilename == (
+                os.path.abspath(self.log_file)
+            ):
+                handler.setFormatter(file_handler.formatter)
+                for log_filter in file_handler.filters:
+                    handler.addFilter(log_filter)
+                root.removeHandler(file_handler)
+                file_handler.close()
+                root.addHandler(handler)
+                return
+
+        _root_logger.warning(
+            "The root logger does not write to %s; adding a handler for it.", self.log_file
+        )
+        handler.setFormatter(logging.Formatter(_LOG_FORMAT, _LOG_DATE_FORMAT))
+        handler.addFilter(_TaskFilter())
+        root.addHandler(handler)
+
+    def enable_result_sink(self):
+        """Save the outputs returned by the logged methods in a new run directory."""
+        if self.result_sink is None:
+            run_name = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+            self.result_sink = ResultSink(os.path.join(self.log_dir, "results", run_name))
+            atexit.register(self.result_sink.close)
+
+    def enable_latency_summary(self):
+        """Log the latency statistics of each method when the program exits."""
+        if not self.latency_summary_enabled:
+            self.latency_summary_enabled = True
+            atexit.register(self.log_latency_summary)
+
+    def log_latency_summary(self):
+        """Log the latency statistics of each method, longest total time first."""
+        for call_signature, summary in self.latencies.summarize().items():
+            self.log(
+                logging.INFO,
+                f"Latency: {call_signature} count={summary.call_count} "
+                f"mean={summary.mean * 1e3:.3f} ms p50={summary.p50 * 1e3:.3f} ms "
+                f"p95={summary.p95 * 1e3:.3f} ms p99={summary.p99 * 1e3:.3f} ms "
+                f"max={summary.max * 1e3:.3f} ms",
+            )
+
+    def set_sampling_policy(self, call_signature: str, policy: SamplingPolicy):
+        """Set which calls of a method are logged, and log the suppressed calls at exit."""
+        if policy == SamplingPolicy():
+            self.samplers.pop(call_signature, None)
+            return
+        self.samplers[call_signature] = Sampler(policy)
+        if not self.sampling_summary_enabled:
+            self.sampling_summary_enabled = True
+            atexit.register(self.log_sampling_summary)
+
+    def log_sampling_summary(self):
+        """Log the number of logged and suppressed calls of each sampled method."""
+        for call_signature, sampler in list(self.samplers.items()):
+            self.log(
+                logging.INFO,
+                f"Sampling: {call_signature} calls={sampler.call_count} "
+                f"logged={sampler.logged_count} suppressed={sampler.suppressed_count}",
+            )
+
+    def log_sampled_call(
+        self, sampler: Sampler, call_signature: str, args: tuple, kwargs: dict, param_names: tuple
+    ) -> None:
+        """Log a sampled method call, after the number of calls suppressed since the last one."""
+        suppressed_count = sampler.take_unreported_count()
+        if suppressed_count:
+            plural = "" if suppressed_count == 1 else "s"
+            self.log(
+                logging.INFO,
+                f"Suppressed: {suppressed_count} call{plural} of {call_signature} not logged",
+            )
+        self.log_call(call_signature, args, kwargs, param_names)
+
+    def save_result(self, call_signature: str, result):
+        """Save the outputs returned by a public method, if it returned a named tuple.
+
+        Only the outermost calls are saved, so that a call adds one row to one table.
+        """
+        if (
+            self.result_sink is not None
+            and isinstance(result, tuple)
+            and hasattr(result, "_fields")
+            and not call_signature.rpartition(".")[2].startswith("_")
+        ):
+            self.result_sink.append(call_signature, time.time(), result)
+
+    def log(self, level: int, message):
+        """Log a message with the given log level, tagged with the current thread or task.
+
+        The thread or task is only looked up when the message is logged.
+        """
+        indent = 1 if _call_depth.get() else 0
+        if self.writer is not None:
+            if logging.root.isEnabledFor(level):
+                self.writer.write(level, _get_task_name(), indent, message)
+            return
+        message = str(message).replace(",", ";")
+        # The task filter of the log file handler tags the record with the thread or task.
+        logging.log(level, f"{'  ' * indent}{message}")
+
+    def log_call(self, call_signature: str, args: tuple, kwargs: dict, param_names: tuple) -> None:
+        """Log the instance method call details including its arguments.
+
+        When the log is written asynchronously, the call is logged when it ends instead, with
+        its return value or exception.
+        """
+        if self.writer is None:
+            self.log_stream_start(call_signature, args, kwargs, param_names)
+
+    def log_stream_start(
+        self, call_signature: str, args: tuple, kwargs: dict, param_names: tuple
     ) -> None:
-        """Log the instance method call details including its arguments and context."""
-        call_signature = f"{instance.__class__.__name__}.{method_name}"
-
-        if not self.call_stack:
-            if call_signature not in self.logged_functions:
-                self.logged_functions.add(call_signature)
-                # Skip 'self' in param names and args
-                args_repr = [
-                    f"{name}={repr(arg)}" for name, arg in zip(list(param_names)[1:], args[1:])
-                ]
-                kwargs_repr = [f"{k}={v!r}" for k, v in kwargs.items()]
-                signature = ", ".join(args_repr + kwargs_repr)
-                self.log(logging.INFO, f"Method Call: {call_signature}")
-                self.log(logging.INFO, f"Arguments: ({signature})")
-                self.indent += 1
-
-        self.call_stack.append(call_signature)
-
-    def log_return(self, instance, method_name: str, result):
-        """Log the return value of an instance method."""
-        call_signature = f"{instance.__class__.__name__}.{method_name}"
-        if self.call_stack and self.call_stack[-1] == call_signature:
-            if call_signature in self.logged_functions:
-                self.indent -= 1
-                self.log(logging.INFO, f"Return: {result!r}")
-                self.log(logging.INFO, "-" * 80)
-                self.logged_functions.remove(call_signature)
-            self.call_stack.pop()
-
-    def log_exception(self, instance, method_name: str, exc: Exception):
-        """Log any exception raised within an instance method."""
-        call_signature = f"{instance.__class__.__name__}.{method_name}"
-        if self.call_stack and self.call_stack[-1] == call_signature:
-            if call_signature in self.logged_functions:
-                self.indent -= 1
-                self.log(logging.ERROR, f"Exception in {call_signature}: {exc}")
-                self.log(logging.ERROR, traceback.format_exc())
-                self.log(logging.INFO, "-" * 40)
-                self.logged_functions.remove(call_signature)
-            self.call_stack.pop()
+        """Log the call that starts a stream, before its responses are received."""
+        self.log(logging.INFO, f"Method Call: {call_signature}")
+        self.log(logging.INFO, _LazyMessage(_format_arguments, param_names, args, kwargs))
+
+    def log_return(
+        self,
+        call_signature: str,
+        args: tuple,
+        kwargs: dict,
+        param_names: tuple,
+        result,
+        duration_ns: int,
+    ):
+        """Log the return value of an instance method.
+
+        When the log is written asynchronously, the whole call is queued as a single record,
+        which the writer thread formats.
+        """
+        if self.writer is not None:
+            self.writer.write_group(
+                _get_task_name(),
+                _format_call,
+                call_signature,
+                args,
+                kwargs,
+                param_names,
+                time.time(),
+                duration_ns,
+                result,
+                None,
+            )
+            return
+        result_format = _get_result_format(call_signature)
+        self.log(logging.INFO, _LazyMessage(_format_return, result, result_format))
+        self.log(logging.INFO, "-" * 80)
+
+    def log_stream_end(self, statistics: StreamStatistics):
+        """Log the timing of a logged stream, after its last response."""
+        self.log(logging.INFO, statistics)
+        self.log(logging.INFO, "-" * 80)
+
+    def log_stream_exception(self, call_signature: str, exc: BaseException):
+        """Log an exception raised by a logged stream."""
+        self.log(logging.ERROR, f"Exception in {call_signature}: {exc}")
+        self.log(logging.ERROR, traceback.format_exc())
+        self.log(logging.INFO, "-" * 40)
+
+    def log_exception(
+        self,
+        call_signature: str,
+        args: tuple,
+        kwargs: dict,
+        param_names: tuple,
+        exc: BaseException,
+        duration_ns: int,
+    ):
+        """Log any exception raised within an instance method.
+
+        When the log is written asynchronously, the whole call is queued as a single record,
+        like a call that returns.
+        """
+        if self.writer is not None:
+            self.writer.write_group(
+                _get_task_name(),
+                _format_call,
+                call_signature,
+                args,
+                kwargs,
+                param_names,
+                time.time(),
+                duration_ns,
+                None,
+                # The traceback of the exception grows as it propagates, so it is taken now.
+                (type(exc), exc, exc.__traceback__),
+            )
+            return
+        self.log(logging.ERROR, f"Exception in {call_signature}: {exc}")
+        self.log(logging.ERROR, traceback.format_exc())
+        self.log(logging.INFO, "-" * 40)
 
 
 logger = _Logger()
 
 
+_root_logger = logging.getLogger()
+
+# Marks the methods that are already wrapped, so that they are not logged twice.
+_LOGGED_ATTRIBUTE = "__ni_sequence_logger_wrapped__"
+
+_CLIENTS_PACKAGE = "clients"
+_import_hook = None
+_import_hook_lock = threading.Lock()
+
+
+def _get_call_signature(instance_class: type, method_name: str):
+    """Get the call signature logged for a method, or None if it must not be logged."""
+    if instance_class.__module__ == "__main__":
+        # Skip logging for instances from the main module
+        return None
+    return f"{instance_class.__name__}.{method_name}"
+
+
+def _log_stream(func, call_signature: str, args: tuple, kwargs: dict, param_names: tuple):
+    """Iterate the stream returned by a generator method, logging and timing its responses.
+
+    Each response is yielded as soon as it is received. The stream is counted as a call in
+    progress only while it produces a response, so that the calls made by the code that
+    consumes the stream are logged as usual.
+    """
+    statistics = StreamStatistics(time.perf_counter_ns())
+    logged = not _call_depth.get()
+    if logged:
+        logger.log_stream_start(call_signature, args, kwargs, param_names)
+    stream = func(*args, **kwargs)
+    while True:
+        depth = _call_depth.get()
+        _call_depth.set(depth + 1)
+        try:
+            response = next(stream)
+        except StopIteration as stop:
+            _call_depth.set(depth)
+            _record_stream(call_signature, statistics, logged)
+            return stop.value
+        except Exception as exc:
+            _call_depth.set(depth)
+            _record_stream(call_signature, statistics, False)
+            if logged:
+                logger.log_stream_exception(call_signature, exc)
+            raise
+        _call_depth.set(depth)
+
+        latency_ns = statistics.add_response(time.perf_counter_ns())
+        if statistics.response_count == 1:
+            logger.latencies.record(f"{call_signature} first response", latency_ns)
+        else:
+            logger.latencies.record(f"{call_signature} inter-arrival", latency_ns)
+        if logged:
+            logger.save_result(call_signature, response)
+        try:
+            yield response
+        except GeneratorExit:
+            statistics.closed = True
+            stream.close()
+            _record_stream(call_signature, statistics, logged)
+            raise
+
+
+async def _log_coroutine(func, call_signature: str, args: tuple, kwargs: dict, param_names: tuple):
+    """Await a coroutine method, logging and timing it like a method call.
+
+    The call depth is a context variable, so the calls awaited concurrently by different
+    asyncio tasks are logged separately. A canceled call is logged like an exception.
+    """
+    depth = _call_depth.get()
+    if not depth:
+        logger.log_call(call_signature, args, kwargs, param_names)
+    _call_depth.set(depth + 1)
+    start_time = time.perf_counter_ns()
+    try:
+        result = await func(*args, **kwargs)
+    except (Exception, asyncio.CancelledError) as exc:
+        duration_ns = time.perf_counter_ns() - start_time
+        logger.latencies.record(call_signature, duration_ns)
+        _call_depth.set(depth)
+        if not depth:
+            logger.log_exception(call_signature, args, kwargs, param_names, exc, duration_ns)
+        raise
+    duration_ns = time.perf_counter_ns() - start_time
+    logger.latencies.record(call_signature, duration_ns)
+    _call_depth.set(depth)
+    if not depth:
+        logger.save_result(call_signature, result)
+        logger.log_return(call_signature, args, kwargs, param_names, result, duration_ns)
+    return result
+
+
+async def _log_async_stream(
+    func, call_signature: str, args: tuple, kwargs: dict, param_names: tuple
+):
+    """Iterate the stream returned by an async generator method, like _log_stream."""
+    statistics = StreamStatistics(time.perf_counter_ns())
+    logged = not _call_depth.get()
+    if logged:
+        logger.log_stream_start(call_signature, args, kwargs, param_names)
+    stream = func(*args, **kwargs)
+    while True:
+        depth = _call_depth.get()
+        _call_depth.set(depth + 1)
+        try:
+            response = await stream.__anext__()
+        except StopAsyncIteration:
+            _call_depth.set(depth)
+            _record_stream(call_signature, statistics, logged)
+            return
+        except (Exception, asyncio.CancelledError) as exc:
+            _call_depth.set(depth)
+            _record_stream(call_signature, statistics, False)
+            if logged:
+                logger.log_stream_exception(call_signature, exc)
+            raise
+        _call_depth.set(depth)
+
+        latency_ns = statistics.add_response(time.perf_counter_ns())
+        if statistics.response_count == 1:
+            logger.latencies.record(f"{call_signature} first response", latency_ns)
+        else:
+            logger.latencies.record(f"{call_signature} inter-arrival", latency_ns)
+        if logged:
+            logger.save_result(call_signature, response)
+        try:
+            yield response
+        except GeneratorExit:
+            statistics.closed = True
+            await stream.aclose()
+            _record_stream(call_signature, statistics, logged)
+            raise
+
+
+def _call_sampled(
+    func, sampler: Sampler, call_signature: str, args: tuple, kwargs: dict, param_names: tuple
+):
+    """Call a method that has a sampling policy, and log the call if the policy selects it.
+
+    A call that is not sampled still counts as a call in progress, so that its nested calls
+    are not logged either. It is logged after it ends if it raised an exception or returned a
+    new value and the policy logs these calls.
+    """
+    logged = sampler.sample()
+    if logged:
+        logger.log_sampled_call(sampler, call_signature, args, kwargs, param_names)
+
+    _call_depth.set(1)
+    start_time = time.perf_counter_ns()
+    try:
+        result = func(*args, **kwargs)
+    except Exception as exc:
+        duration_ns = time.perf_counter_ns() - start_time
+        logger.latencies.record(call_signature, duration_ns)
+        _call_depth.set(0)
+        if not logged:
+            logged = sampler.policy.on_exception
+            if logged:
+                logger.log_sampled_call(sampler, call_signature, args, kwargs, param_names)
+            else:
+                sampler.suppress()
+        if logged:
+            logger.log_exception(call_signature, args, kwargs, param_names, exc, duration_ns)
+        raise
+    duration_ns = time.perf_counter_ns() - start_time
+    logger.latencies.record(call_signature, duration_ns)
+    _call_depth.set(0)
+    logger.save_result(call_signature, result)
+
+    changed = sampler.is_changed(result)
+    if not logged:
+        logged = changed
+        if logged:
+            logger.log_sampled_call(sampler, call_signature, args, kwargs, param_names)
+        else:
+            sampler.suppress()
+    if logged:
+        logger.log_return(call_signature, args, kwargs, param_names, result, duration_ns)
+    return result
+
+
+def _record_stream(call_signature: str, statistics: StreamStatistics, logged: bool):
+    statistics.end_time_ns = time.perf_counter_ns()
+    logger.latencies.record(call_signature, statistics.end_time_ns - statistics.start_time_ns)
+    if logged:
+        logger.log_stream_end(statistics)
+
+
 def log_instance_method(func):
-    """Decorator to log instance method calls, returns, and exceptions."""
+    """Decorator to log instance method calls, returns, and exceptions.
+
+    The parameter names are computed when the method is decorated, and the call signature
+    once per instance class. The duration of each call is added to the latency histogram
+    of the method, except for the nested calls of private methods, which are called
+    directly. For a generator method, such as stream_measure, the iteration of the
+    returned stream is logged and timed instead of the call that creates it. Coroutine and
+    async generator methods, such as those of the async clients, are logged while they are
+    awaited and iterated, and are not sampled. When the INFO level is disabled, for example
+    with ``logging.getLogger().setLevel(logging.WARNING)``, the method is called directly.
+    """
+    method_name = func.__name__
+    param_names = tuple(inspect.signature(func).parameters)
+    is_generator = inspect.isgeneratorfunction(func)
+    is_coroutine = inspect.iscoroutinefunction(func)
+    is_async_generator = inspect.isasyncgenfunction(func)
+    is_private = method_name.startswith("_")
+    call_signatures = {}
 
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        # Check if this is an instance method call
-        if not args or not hasattr(args[0], "__class__"):
-            # This is not an instance method call, just return without logging
+        # Check if logging is enabled and if this is an instance method call
+        if not args or not _root_logger.isEnabledFor(logging.INFO):
             return func(*args, **kwargs)
-
-        instance = args[0]
-        if instance.__class__.__module__ == "__main__":
-            # Skip logging for instances from the main module
+        if is_private and _call_depth.get():
+            # A private helper called by another logged method is neither logged nor timed.
             return func(*args, **kwargs)
 
-        context = os.path.basename(instance.__class__.__module__)
-        param_names = list(inspect.signature(func).parameters.keys())
+        instance_class = args[0].__class__
+        try:
+            call_signature = call_signatures[instance_class]
+        except KeyError:
+            call_signature = _get_call_signature(instance_class, method_name)
+            call_signatures[instance_class] = call_signature
+        if call_signature is None:
+            return func(*args, **kwargs)
+        if is_generator:
+            return _log_stream(func, call_signature, args, kwargs, param_names)
+        if is_coroutine:
+            return _log_coroutine(func, call_signature, args, kwargs, param_names)
+        if is_async_generator:
+            return _log_async_stream(func, call_signature, args, kwargs, param_names)
+        depth = _call_depth.get()
+        if not depth:
+            sampler = logger.samplers.get(call_signature)
+            if sampler is not None:
+                return _call_sampled(func, sampler, call_signature, args, kwargs, param_names)
+            logger.log_call(call_signature, args, kwargs, param_names)
 
-        logger.log_call(instance, func.__name__, args, kwargs, context, param_names)
+        _call_depth.set(depth + 1)
+        start_time = time.perf_counter_ns()
         try:
             result = func(*args, **kwargs)
-            logger.log_return(instance, func.__name__, result)
-            return result
         except Exception as exc:
-            logger.log_exception(instance, func.__name__, exc)
+            duration_ns = time.perf_counter_ns() - start_time
+            logger.latencies.record(call_signature, duration_ns)
+            _call_depth.set(depth)
+            if not depth:
+                logger.log_exception(call_signature, args, kwargs, param_names, exc, duration_ns)
             raise
+        duration_ns = time.perf_counter_ns() - start_time
+        logger.latencies.record(call_signature, duration_ns)
+        _call_depth.set(depth)
+        if not depth:
+            logger.save_result(call_signature, result)
+            logger.log_return(call_signature, args, kwargs, param_names, result, duration_ns)
+        return result
 
+    setattr(wrapper, _LOGGED_ATTRIBUTE, True)
     return wrapper
 
 
 def apply_logging_to_class(cls):
-    """Apply logging to all methods of a class."""
+    """Apply logging to all methods of a class.
+
+    Methods that are already logged, such as the methods inherited from a class that was
+    already instrumented, are not wrapped again.
+    """
     for name, method in inspect.getmembers(cls, predicate=inspect.isfunction):
-        if not name.startswith("__"):
+        if not name.startswith("__") and not getattr(method, _LOGGED_ATTRIBUTE, False):
             setattr(cls, name, log_instance_method(method))
     return cls
 
@@ -138,10 +675,156 @@ def apply_logging_to_module(module):
 def apply_logging_to_all_modules():
     """Apply logging to all modules that match a specific pattern."""
     for module_name, module in sys.modules.items():
-        if module_name.startswith("clients."):
+        # Skip the private support modules of the generated clients package.
+        if module_name.startswith("clients.") and not module_name.startswith("clients._"):
             apply_logging_to_module(module)
 
 
-def init_log():
-    """Initialize logging for all relevant modules."""
-    apply_logging_to_all_modules()
+def apply_logging_on_import():
+    """Apply logging to the client modules when they are imported.
+
+    An import hook instruments each public module of the clients package after it is
+    executed, so the clients that are loaded on first use are logged without scanning
+    sys.modules. The client modules that are already imported are found through the
+    clients package. Installing the hook again has no effect.
+    """
+    global _import_hook
+    with _import_hook_lock:
+        if _import_hook is None:
+            _import_hook = ClientImportHook(_CLIENTS_PACKAGE, apply_logging_to_module)
+            sys.meta_path.insert(0, _import_hook)
+
+    package = sys.modules.get(_CLIENTS_PACKAGE)
+    if package is None:
+        return
+    # The generated clients package lists its client modules in __all__, and binds its other
+    # imported modules, such as aio, to their names.
+    for name in set(getattr(package, "__all__", ())) | set(vars(package)):
+        module = sys.modules.get(f"{_CLIENTS_PACKAGE}.{name}")
+        if module is not None and not name.startswith("_"):
+            apply_logging_to_module(module)
+
+
+def get_latency_summary():
+    """Get the latency statistics of each logged method.
+
+    Returns:
+        A dictionary mapping each method, such as "NIDCPowerSourceDCVoltageClient.measure",
+        to its call count and its mean, 50th, 95th and 99th percentile and maximum latencies
+        in seconds. The methods are sorted by total time, longest first.
+    """
+    return logger.latencies.summarize()
+
+
+def set_result_format(
+    client_class, max_elements: int = 10, max_string_length: int = 200, full: bool = False
+):
+    """Set how the return values of a client class are logged.
+
+    By default, sequences with more than 10 elements are shortened and strings longer than
+    200 characters are truncated. Long numeric sequences, such as the measurements of
+    many sites, are summarized with their count, minimum, maximum and mean.
+
+    Args:
+        client_class: The client class, or its name.
+        max_elements: The maximum number of elements logged per sequence.
+        max_string_length: The maximum number of characters logged per string.
+        full: Whether to log the complete return values instead.
+    """
+    class_name = client_class if isinstance(client_class, str) else client_class.__name__
+    logger.result_formats[class_name] = ResultFormat(max_elements, max_string_length, full)
+
+
+def set_sampling(
+    method,
+    every=1,
+    max_per_second=None,
+    on_exception: bool = False,
+    on_change: bool = False,
+):
+    """Set which calls of a method are logged, to limit the log of methods called in a loop.
+
+    A call is logged if it is one of every calls and the rate limit allows it, if it raises
+    an exception and on_exception is True, or if its return value differs from the return
+    value of the previous call and on_change is True. Before each logged call, the number of
+    calls suppressed since the previous logged call is logged, and the number of calls,
+    logged calls and suppressed calls of each sampled method is logged when the program
+    exits. The latencies and the saved results include all the calls. Calling the method
+    with the default arguments logs all the calls again. Streams and the methods of the
+    async clients are not sampled.
+
+    Args:
+        method: The method, such as NIDCPowerSourceDCVoltageClient.measure, or its call
+            signature, such as "NIDCPowerSourceDCVoltageClient.measure".
+        every: Log one of every this many calls, starting with the first. None logs none of
+            the calls, except those selected by on_exception and on_change.
+        max_per_second: The maximum number of calls logged per second, or None.
+        on_exception: Whether to log the calls that raise an exception.
+        on_change: Whether to log the calls whose return value differs from the return
+            value of the previous call.
+
+    Raises:
+        ValueError: If every is less than 1 or max_per_second is not greater than 0.
+    """
+    call_signature = method if isinstance(method, str) else method.__qualname__
+    logger.set_sampling_policy(
+        call_signature, SamplingPolicy(every, max_per_second, on_exception, on_change)
+    )
+
+
+def init_log(
+    asynchronous: bool = False,
+    queue_size: int = 10000,
+    overflow_policy: str = "block",
+    save_results: bool = False,
+    latency_summary: bool = False,
+    import_hook: bool = False,
+    max_log_size: Optional[int] = None,
+    rotation_interval: Optional[float] = None,
+    retained_logs: int = 10,
+    compress_logs: bool = True,
+):
+    """Initialize logging for all relevant modules.
+
+    Args:
+        asynchronous: Whether to write the log from a background thread. The logged methods
+            then only queue a single record per call when the call ends, and the lines of the
+            call are formatted by the background thread. The queued records are written when
+            the program exits.
+        queue_size: The maximum number of records waiting to be written, when asynchronous.
+            A logged call counts as one record.
+        overflow_policy: What to do with a record when the queue is full, when asynchronous:
+            "block" waits for space, "drop_newest" discards the new record and "drop_oldest"
+            discards the oldest queued record. Dropped records are counted in the log.
+        save_results: Whether to save the outputs returned by the outermost calls of the
+            public logged methods as binary columns in the 'logs/results' directory, one
+            directory per run. Use load_result_column to load a column as a NumPy array.
+        latency_summary: Whether to log the latency statistics of each method when the
+            program exits. The statistics can also be queried with get_latency_summary.
+        import_hook: Whether to apply logging to the client modules as they are imported,
+            instead of scanning the modules that are already imported. Use it when the
+            clients are loaded on first use, as in the generated clients package.
+        max_log_size: The size in bytes at which the log file is rotated, or None. The
+            rotated segments are renamed with the time of the rotation, such as
+            'log_20241003_111902_123456.csv', and compressed on a background thread.
+        rotation_interval: The number of seconds after which the log file is rotated, or
+            None.
+        retained_logs: The maximum number of rotated segments kept in the 'logs' directory,
+            when the log file is rotated. The oldest segments are removed.
+        compress_logs: Whether to compress the rotated segments with gzip.
+
+    Raises:
+        ValueError: If the overflow policy, the queue size or a rotation setting is not valid.
+    """
+    if max_log_size is not None or rotation_interval is not None:
+        logger.enable_rotation(max_log_size, rotation_interval, retained_logs, compress_logs)
+    if asynchronous:
+        logger.enable_async_logging(queue_size, overflow_policy)
+    if save_results:
+        logger.enable_result_sink()
+    if latency_summary:
+        logger.enable_latency_summary()
+    if import_hook:
+        apply_logging_on_import()
+    else:
+        apply_logging_to_all_modules()
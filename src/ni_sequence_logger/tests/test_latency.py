@@ -0,0 +1,51 @@
+"""Tests of the latency histograms of the logged methods."""
+
+import unittest
+
+from ni_sequence_logger import logger
+from ni_sequence_logger._latency import LatencyRecorder
+
+
+class _Client:
+    # The logger skips the classes defined in the main module.
+    __module__ = "clients.test_client"
+
+    def measure(self) -> float:
+        return self.fetch() + self._convert(1.0)
+
+    def fetch(self) -> float:
+        return self._convert(0.5)
+
+    def _convert(self, voltage: float) -> float:
+        return voltage * 2
+
+
+logger.apply_logging_to_class(_Client)
+
+
+class LatencyTests(unittest.TestCase):
+    """Tests which calls are added to the latency histograms."""
+
+    def setUp(self) -> None:
+        """Start with empty histograms."""
+        logger.logger.latencies = LatencyRecorder()
+
+    def test___measure___nested_private_calls_not_timed(self) -> None:
+        _Client().measure()
+
+        self.assertEqual(
+            {
+                method: summary.call_count
+                for method, summary in logger.get_latency_summary().items()
+            },
+            {"_Client.measure": 1, "_Client.fetch": 1},
+        )
+
+    def test___private_method___outermost_call_timed(self) -> None:
+        _Client()._convert(1.0)
+
+        self.assertEqual(list(logger.get_latency_summary()), ["_Client._convert"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+"""Tests of the outputs saved by the logged methods."""
+
+import os
+import tempfile
+import unittest
+from typing import Iterator, NamedTuple
+
+from ni_sequence_logger import logger
+from ni_sequence_logger._result_sink import ResultSink
+
+
+class Outputs(NamedTuple):
+    """Outputs of the test client."""
+
+    voltage_measurement: float
+
+
+class _Client:
+    # The logger skips the classes defined in the main module.
+    __module__ = "clients.test_client"
+
+    def measure(self, voltage: float) -> Outputs:
+        # The nested calls also return outputs, but only the outer call is saved.
+        return self.fetch(self._convert(voltage))
+
+    def measure_last(self, voltage: float) -> Outputs:
+        # Like the generated clients, whose measure returns the last response of the stream.
+        for outputs in self.stream_measure(voltage):
+            pass
+        return outputs
+
+    def stream_measure(self, voltage: float) -> Iterator[Outputs]:
+        for index in range(3):
+            yield Outputs(voltage * index)
+
+    def fetch(self, voltage: float) -> Outputs:
+        return Outputs(voltage)
+
+    def _convert(self, voltage: float) -> float:
+        return Outputs(voltage * 2).voltage_measurement
+
+    def _read(self) -> Outputs:
+        return Outputs(0.0)
+
+
+logger.apply_logging_to_class(_Client)
+
+
+class SaveResultsTests(unittest.TestCase):
+    """Tests the tables of outputs saved by the result sink of the logger."""
+
+    def setUp(self) -> None:
+        """Save the outputs in a temporary run directory."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.run_directory = directory.name
+        logger.logger.result_sink = ResultSink(self.run_directory)
+
+    def tearDown(self) -> None:
+        """Stop saving the outputs."""
+        assert logger.logger.result_sink is not None
+        logger.logger.result_sink.close()
+        logger.logger.result_sink = None
+
+    def _get_row_counts(self) -> dict:
+        assert logger.logger.result_sink is not None
+        logger.logger.result_sink.flush()
+        # Each row has one float64 time.
+        return {
+            table: os.path.getsize(os.path.join(self.run_directory, table, "_time.values")) // 8
+            for table in os.listdir(self.run_directory)
+        }
+
+    def test___measure___one_row_in_one_table(self) -> None:
+        _Client().measure(1.5)
+
+        self.assertEqual(self._get_row_counts(), {"_Client.measure": 1})
+
+    def test___measure_from_stream___one_row_in_one_table(self) -> None:
+        _Client().measure_last(1.5)
+
+        self.assertEqual(self._get_row_counts(), {"_Client.measure_last": 1})
+
+    def test___stream_measure___one_row_per_response(self) -> None:
+        list(_Client().stream_measure(1.5))
+
+        self.assertEqual(self._get_row_counts(), {"_Client.stream_measure": 3})
+
+    def test___private_method___no_table(self) -> None:
+        _Client()._read()
+
+        self.assertEqual(self._get_row_counts(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()